@@ -0,0 +1,380 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# COLUMNS OF Date AND Duration, FOR VECTORIZED TIME MATH
+# REQUIRES numpy
+#
+import numpy as np
+from mo_dots import Null, null_types
+from mo_imports import delay_import
+
+from mo_times.civil import EPOCH_MONTH, days_from_month, join_unix, month_from_days
+from mo_times.dates import Date, ISO8601, _unix2Date
+from mo_times.formatter import compile_format
+from mo_times.durations import DAY, Duration, MILLI_VALUES
+
+logger = delay_import("mo_logs.logger")
+
+WEEK_OFFSET = 4 * 86400  # SAME THURSDAY OFFSET AS Date.floor()
+MIN_FAST_FORMAT = -30610224000  # 1000-01-01
+MAX_FAST_FORMAT = 253402300799  # 9999-12-31 23:59:59
+FAST_FORMATS = {"%Y-%m-%d %H:%M:%S": " ", ISO8601: "T", "%Y-%m-%d": None}
+
+
+class DateArray:
+    """
+    COLUMN OF Date, STORED AS float64 UNIX SECONDS (nan FOR MISSING)
+    RESULTS MATCH THE SCALAR Date METHODS
+    """
+
+    __slots__ = ["unix"]
+
+    def __init__(self, values):
+        if isinstance(values, DateArray):
+            self.unix = values.unix
+            return
+        values = np.asarray(values)
+        kind = values.dtype.kind
+        if kind in "fiu":
+            unix = values.astype(np.float64)
+            # LIKE Date(), NUMBERS WAY TOO BIG TO BE unix SECONDS ARE MILLISECONDS
+            self.unix = np.where(unix > 9999999999, unix / 1000, unix)
+        elif kind == "M":
+            micro = values.astype("datetime64[us]")
+            self.unix = np.where(np.isnat(micro), np.nan, micro.astype(np.int64) / 1_000_000)
+        else:
+            values = values.tolist()
+            if all(v is None or isinstance(v, str) for v in values):
+                self.unix = np.asarray(Date.parse_many(values), dtype=np.float64)
+            else:
+                self.unix = np.array([np.nan if v == None else Date(v).unix for v in values], dtype=np.float64)
+
+    @classmethod
+    def from_unix(cls, unix):
+        output = object.__new__(cls)
+        output.unix = np.asarray(unix, dtype=np.float64)
+        return output
+
+    def __len__(self):
+        return len(self.unix)
+
+    def __iter__(self):
+        for u in self.unix.tolist():
+            yield Null if u != u else _unix2Date(u)
+
+    def __getitem__(self, item):
+        value = self.unix[item]
+        if isinstance(value, np.ndarray):
+            return DateArray.from_unix(value)
+        value = float(value)
+        return Null if value != value else _unix2Date(value)
+
+    @property
+    def datetime64(self):
+        """
+        RETURN AS numpy datetime64[us]
+        """
+        seconds, micro = _split(self.unix)
+        output = (seconds * 1_000_000 + micro).astype("datetime64[us]")
+        output[np.isnan(self.unix)] = np.datetime64("NaT")
+        return output
+
+    def floor(self, duration=None):
+        if duration is None:
+            duration = DAY
+        return DateArray.from_unix(_floor(self.unix, duration))
+
+    def ceiling(self, duration=None):
+        if duration is None:
+            duration = DAY
+        if duration.month:
+            floor = _floor(self.unix, duration)
+            return DateArray.from_unix(np.where(floor == self.unix, floor, _add_months(floor, int(duration.month))))
+        return DateArray.from_unix(-_floor(-self.unix, duration))
+
+    def add(self, other):
+        if other is None or other.__class__ in null_types:
+            return DateArray.from_unix(np.full(len(self.unix), np.nan))
+        elif isinstance(other, Duration):
+            if other.month:
+                return DateArray.from_unix(_add_months(self.unix, int(other.month)))
+            return DateArray.from_unix(self.unix + other.seconds)
+        elif isinstance(other, DurationArray):
+            month = other.month.astype(np.int64)
+            return DateArray.from_unix(
+                np.where(month != 0, _add_months(self.unix, month), self.unix + other.milli / 1000)
+            )
+        else:
+            logger.error("can not add {type} to DateArray", type=other.__class__.__name__)
+
+    def __add__(self, other):
+        return self.add(other)
+
+    def __sub__(self, other):
+        if isinstance(other, DateArray):
+            return DurationArray(milli=(self.unix - other.unix) * 1000)
+        elif isinstance(other, (Duration, DurationArray)):
+            return self.add(-other)
+        elif other is None or other.__class__ in null_types:
+            return self.add(other)
+        return DurationArray(milli=(self.unix - Date(other).unix) * 1000)
+
+    def format(self, format="%Y-%m-%d %H:%M:%S"):
+        """
+        RETURN LIST OF STRINGS (None FOR MISSING)
+        """
+        unix = self.unix
+        sep = FAST_FORMATS.get(format, "")
+        if sep != "" and len(unix) and np.all((MIN_FAST_FORMAT <= unix) & (unix <= MAX_FAST_FORMAT)):
+            seconds, _ = _split(unix)
+            if sep is None:
+                return np.datetime_as_string(seconds.astype("datetime64[s]"), unit="D").tolist()
+            text = np.datetime_as_string(seconds.astype("datetime64[s]"), unit="s")
+            if sep == " ":
+                return np.char.replace(text, "T", " ").tolist()
+            return np.char.add(text, "Z").tolist()
+        return compile_format(format).format_many(unix.tolist())
+
+    def _compare_to(self, other):
+        if isinstance(other, DateArray):
+            return other.unix
+        elif isinstance(other, (int, float, np.ndarray)):
+            return other
+        return Date(other).unix
+
+    def __eq__(self, other):
+        if other is None or other.__class__ in null_types:
+            return np.zeros(len(self.unix), dtype=bool)
+        return self.unix == self._compare_to(other)
+
+    def __ne__(self, other):
+        return ~self.__eq__(other)
+
+    def __lt__(self, other):
+        if other is None or other.__class__ in null_types:
+            return np.zeros(len(self.unix), dtype=bool)
+        return self.unix < self._compare_to(other)
+
+    def __le__(self, other):
+        if other is None or other.__class__ in null_types:
+            return np.zeros(len(self.unix), dtype=bool)
+        return self.unix <= self._compare_to(other)
+
+    def __gt__(self, other):
+        if other is None or other.__class__ in null_types:
+            return np.zeros(len(self.unix), dtype=bool)
+        return self.unix > self._compare_to(other)
+
+    def __ge__(self, other):
+        if other is None or other.__class__ in null_types:
+            return np.zeros(len(self.unix), dtype=bool)
+        return self.unix >= self._compare_to(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"DateArray({self.format()})"
+
+
+class DurationArray:
+    """
+    COLUMN OF Duration, STORED AS float64 milli AND month
+    """
+
+    __slots__ = ["milli", "month"]
+
+    def __init__(self, values=None, milli=None, month=None):
+        if values is not None:
+            values = [Duration(v) for v in values]
+            self.milli = np.array([v.milli for v in values], dtype=np.float64)
+            self.month = np.array([v.month for v in values], dtype=np.float64)
+            return
+        self.milli = np.asarray(milli, dtype=np.float64)
+        if month is None:
+            self.month = np.zeros(len(self.milli), dtype=np.float64)
+        else:
+            self.month = np.asarray(month, dtype=np.float64)
+
+    @property
+    def seconds(self):
+        return self.milli / 1000
+
+    def __len__(self):
+        return len(self.milli)
+
+    def __iter__(self):
+        for milli, month in zip(self.milli.tolist(), self.month.tolist()):
+            yield Null if milli != milli else _duration(milli, month)
+
+    def __getitem__(self, item):
+        milli, month = self.milli[item], self.month[item]
+        if isinstance(milli, np.ndarray):
+            return DurationArray(milli=milli, month=month)
+        milli = float(milli)
+        return Null if milli != milli else _duration(milli, float(month))
+
+    def floor(self, interval):
+        if not isinstance(interval, Duration):
+            logger.error("Expecting an interval as a Duration object")
+        if interval.month:
+            month = np.where(
+                self.month != 0,
+                np.floor(self.month / interval.month) * interval.month,
+                np.floor(self.milli * 12 / MILLI_VALUES["year"] / interval.month) * interval.month,
+            )
+            return DurationArray(milli=month * MILLI_VALUES.month, month=month)
+        return DurationArray(milli=np.floor(self.milli / interval.milli) * interval.milli)
+
+    def __add__(self, other):
+        other = _as_duration_array(other)
+        return DurationArray(milli=self.milli + other.milli, month=self.month + other.month)
+
+    def __sub__(self, other):
+        other = _as_duration_array(other)
+        return DurationArray(milli=self.milli - other.milli, month=self.month - other.month)
+
+    def __neg__(self):
+        return DurationArray(milli=-self.milli, month=-self.month)
+
+    def __mul__(self, amount):
+        return DurationArray(milli=self.milli * amount, month=self.month * amount)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, (Duration, str)):
+            other = Duration(other)
+            if other.month:
+                logger.error("Do not know how to divide by a month-based duration")
+            return self.milli / other.milli
+        return DurationArray(milli=self.milli / other, month=self.month / other)
+
+    def __eq__(self, other):
+        other = _as_duration_array(other)
+        return (self.milli == other.milli) & (self.month == other.month)
+
+    def __lt__(self, other):
+        return self.milli < _as_duration_array(other).milli
+
+    def __le__(self, other):
+        return self.milli <= _as_duration_array(other).milli
+
+    def __gt__(self, other):
+        return self.milli > _as_duration_array(other).milli
+
+    def __ge__(self, other):
+        return self.milli >= _as_duration_array(other).milli
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"DurationArray({[None if d == None else str(d) for d in self]})"
+
+
+def _duration(milli, month):
+    output = Duration(0)
+    output.milli = milli
+    output.month = month
+    return output
+
+
+def _as_duration_array(value):
+    if isinstance(value, DurationArray):
+        return value
+    value = Duration(value)
+    return DurationArray(milli=value.milli, month=value.month)
+
+
+def _split(unix):
+    """
+    RETURN (seconds, micro) AS int64, ROUNDED TO THE MICROSECOND LIKE utcfromtimestamp()
+    """
+    with np.errstate(invalid="ignore"):
+        seconds = np.floor(unix)
+        micro = np.round((unix - seconds) * 1_000_000)
+        carry = micro >= 1_000_000
+        return seconds.astype(np.int64) + carry, (micro - carry * 1_000_000).astype(np.int64)
+
+
+def _days(unix):
+    """
+    RETURN int64 DAYS SINCE EPOCH, AFTER ROUNDING TO THE MICROSECOND LIKE utcfromtimestamp()
+    """
+    with np.errstate(invalid="ignore"):
+        seconds = np.floor(unix)
+        seconds += (unix - seconds) * 1_000_000 >= 999_999.5  # ROUNDS UP TO NEXT SECOND
+        return np.floor(seconds / 86400).astype(np.int64)
+
+
+def _month_from_days(days):
+    """
+    month_from_days(), USING A LOOKUP TABLE WHEN THE DAYS SPAN A SMALL RANGE
+    """
+    if not len(days):
+        return days
+    lo, hi = int(days.min()), int(days.max())
+    if hi - lo >= len(days):
+        return month_from_days(days)
+    return month_from_days(np.arange(lo, hi + 1, dtype=np.int64))[days - lo]
+
+
+def _days_from_month(months):
+    if not len(months):
+        return months
+    lo, hi = int(months.min()), int(months.max())
+    if hi - lo >= len(months):
+        return days_from_month(months)
+    return days_from_month(np.arange(lo, hi + 1, dtype=np.int64))[months - lo]
+
+
+def _floor(unix, duration):
+    if duration.month:
+        step = int(duration.month)
+        months = (_month_from_days(_days(unix)) + EPOCH_MONTH) // step * step - EPOCH_MONTH
+        return np.where(np.isnan(unix), np.nan, _days_from_month(months) * 86400.0)
+    elif duration.milli % (7 * 86400000) == 0:
+        return np.floor((unix + WEEK_OFFSET) / duration.seconds) * duration.seconds - WEEK_OFFSET
+    else:
+        return np.floor(unix / duration.seconds) * duration.seconds
+
+
+def _add_months(unix, num_months):
+    """
+    SAME CALENDAR RULES AS Date.add(): THE LAST DAY OF A MONTH MAPS TO THE LAST DAY
+    OF THE TARGET MONTH, OTHER DAYS ARE CLAMPED TO THE TARGET MONTH LENGTH
+    """
+    seconds, micro = _split(unix)
+    days = seconds // 86400
+    time_of_day = seconds - days * 86400
+    months = _month_from_days(days)
+    first = _days_from_month(months)
+    day = days - first
+    month_length = _days_from_month(months + 1) - first
+
+    target = months + num_months
+    target_first = _days_from_month(target)
+    target_length = _days_from_month(target + 1) - target_first
+    target_day = np.where(day == month_length - 1, target_length - 1, np.minimum(day, target_length - 1))
+    missing = np.isnan(unix)
+    output = _join(np.where(missing, 0, (target_first + target_day) * 86400 + time_of_day), micro, missing)
+    return np.where(missing, np.nan, output)
+
+
+def _join(seconds, micro, missing):
+    """
+    civil.join_unix() FOR int64 ARRAYS: (seconds * 1_000_000 + micro) / 1_000_000, CORRECTLY ROUNDED
+    float64 HOLDS THE NUMERATOR EXACTLY UP TO 2**53 (ABOUT 285 YEARS FROM 1970), SO ONE
+    DIVISION ROUNDS THE SAME AS PYTHON'S int / int; FURTHER OUT, join_unix() IS CALLED PER VALUE
+    """
+    total = seconds * 1_000_000 + micro
+    output = total / 1_000_000
+    far = (np.abs(total) > 2**53) & ~missing
+    if far.any():
+        output[far] = [join_unix(s, m) for s, m in zip(seconds[far].tolist(), micro[far].tolist())]
+    return output
@@ -0,0 +1,225 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from bisect import bisect_left
+from itertools import repeat
+from math import log
+
+from mo_dots import Data, list_to_data
+from mo_imports import delay_import
+
+from mo_times.civil import month_from_days, split_unix
+from mo_times.dates import Date, _unix, _unix2Date
+from mo_times.durations import COMMON_INTERVALS, Duration
+
+logger = delay_import("mo_logs.logger")
+
+
+class TimeBuckets:
+    """
+    STREAMING HISTOGRAM: COUNT AND SUM OF VALUES FOR EACH interval-SIZED BUCKET
+    BUCKETS ARE ALIGNED LIKE Date.floor(interval) (CALENDAR MONTHS, THURSDAY-ALIGNED WEEKS)
+
+    lateness - KEEP BUCKETS OPEN UNTIL THE NEWEST EVENT IS THIS MUCH PAST THEIR END
+               (None MEANS KEEP ALL BUCKETS UNTIL close() IS CALLED)
+    on_close - CALLED WITH Data(start, end, count, sum) FOR EACH BUCKET THAT IS CLOSED
+               (CLOSED BUCKETS ARE DROPPED, SO MEMORY IS BOUNDED BY lateness)
+    """
+
+    __slots__ = [
+        "interval",
+        "lateness",
+        "on_close",
+        "late",
+        "_buckets",
+        "_start",
+        "_end",
+        "_current",
+        "_newest",
+        "_closed",
+    ]
+
+    def __init__(self, interval, lateness=None, on_close=None):
+        if not isinstance(interval, Duration):
+            interval = Duration(interval)
+        if interval.month <= 0 and interval.milli <= 0:
+            logger.error("Expecting a positive interval, not {interval}", interval=str(interval))
+        self.interval = interval
+        self.lateness = None if lateness is None else Duration(lateness).seconds
+        self.on_close = on_close
+        self.late = 0  # NUMBER OF EVENTS THAT ARRIVED AFTER THEIR BUCKET WAS CLOSED
+        self._buckets = {}  # MAP FROM BUCKET START (unix) TO [count, sum]
+        self._start = 0.0  # CURRENT BUCKET, FOR THE FAST PATH
+        self._end = 0.0
+        self._current = None
+        self._newest = float("-inf")  # LARGEST unix SEEN
+        self._closed = float("-inf")  # ALL BUCKETS BEFORE THIS ARE CLOSED
+
+    def add(self, date, value=1):
+        """
+        COUNT ONE EVENT AT date, WITH GIVEN value
+        """
+        unix = _unix(date)
+        if unix is None:
+            return
+        if self._start <= unix < self._end:
+            cell = self._current
+            cell[0] += 1
+            cell[1] += value
+            return
+        self._add_slow(unix, value)
+
+    def extend(self, dates, values=None):
+        """
+        COUNT MANY EVENTS; values IS None (ALL 1) OR THE SAME LENGTH AS dates
+        """
+        if values is None:
+            values = repeat(1)
+        start, end, cell = self._start, self._end, self._current
+        for date, value in zip(dates, values):
+            if date.__class__ is Date:
+                unix = date.unix
+            else:
+                unix = _unix(date)
+                if unix is None:
+                    continue
+            if start <= unix < end:
+                cell[0] += 1
+                cell[1] += value
+            else:
+                self._add_slow(unix, value)
+                start, end, cell = self._start, self._end, self._current
+
+    def _add_slow(self, unix, value):
+        if unix < self._closed:
+            self.late += 1
+            return
+        start = _unix2Date(unix).floor(self.interval).unix
+        cell = self._buckets.get(start)
+        if cell is None:
+            cell = self._buckets[start] = [0, 0]
+        cell[0] += 1
+        cell[1] += value
+        self._start, self._end, self._current = start, self._bucket_end(start), cell
+
+        if unix > self._newest:
+            self._newest = unix
+            if self.lateness is not None:
+                before = unix - self.lateness
+                if self._bucket_end(min(self._buckets)) <= before:
+                    self.close(before)
+
+    def _bucket_end(self, start):
+        return _unix2Date(start).add(self.interval).unix
+
+    def close(self, before=None):
+        """
+        CLOSE (AND FORGET) ALL BUCKETS THAT END AT, OR BEFORE, before; ALL BUCKETS IF before IS None
+        RETURN LIST OF CLOSED BUCKETS
+        """
+        if before is None:
+            before = float("inf")
+        else:
+            before = _unix(before)
+            # EVERYTHING BEFORE THE BUCKET HOLDING before IS NOW LATE
+            self._closed = max(self._closed, _unix2Date(before).floor(self.interval).unix)
+        closed = []
+        for start in sorted(self._buckets):
+            end = self._bucket_end(start)
+            if end > before:
+                break
+            count, total = self._buckets.pop(start)
+            closed.append(Data(start=_unix2Date(start), end=_unix2Date(end), count=count, sum=total))
+            if start == self._start:
+                self._start, self._end, self._current = 0.0, 0.0, None
+            self._closed = max(self._closed, end)
+        if self.on_close:
+            for bucket in closed:
+                self.on_close(bucket)
+        return list_to_data(closed)
+
+    def merge(self, other):
+        """
+        ADD THE BUCKETS OF other (ANOTHER WORKER'S TimeBuckets, WITH THE SAME interval) TO self
+        """
+        if other.interval != self.interval:
+            logger.error(
+                "Can not merge {other} buckets into {self} buckets", other=str(other.interval), self=str(self.interval)
+            )
+        for start, (count, total) in other._buckets.items():
+            if start < self._closed:
+                self.late += count
+                continue
+            cell = self._buckets.get(start)
+            if cell is None:
+                self._buckets[start] = [count, total]
+            else:
+                cell[0] += count
+                cell[1] += total
+        self.late += other.late
+        self._newest = max(self._newest, other._newest)
+        self._start, self._end, self._current = 0.0, 0.0, None
+        return self
+
+    def __len__(self):
+        return len(self._buckets)
+
+    @property
+    def buckets(self):
+        """
+        RETURN LIST OF OPEN BUCKETS, AS Data(start, end, count, sum), IN TIME ORDER
+        """
+        return list_to_data([
+            {"start": _unix2Date(start), "end": _unix2Date(self._bucket_end(start)), "count": count, "sum": total}
+            for start, (count, total) in sorted(self._buckets.items())
+        ])
+
+
+def best_interval(min, max, target):
+    """
+    RETURN THE COMMON_INTERVALS MEMBER THAT SPLITS [min, max) INTO CLOSEST TO target BUCKETS
+    RETURN Data(interval, min, max, count) WHERE min AND max ARE ROUNDED OUT TO BUCKET BOUNDARIES
+    """
+    min, max = Date(min), Date(max)
+    span = max.unix - min.unix
+    if span <= 0 or target < 1:
+        interval = _intervals[0]
+    else:
+        # CLOSEST IN RATIO (LOG SPACE), ONLY THE TWO NEIGHBOURS NEED CHECKING
+        size = span / target
+        i = bisect_left(_sizes, size)
+        if i == 0:
+            interval = _intervals[0]
+        elif i == len(_sizes):
+            interval = _intervals[-1]
+        elif log(_sizes[i] / size) < log(size / _sizes[i - 1]):
+            interval = _intervals[i]
+        else:
+            interval = _intervals[i - 1]
+
+    start = min.floor(interval)
+    end = max.floor(interval)
+    if end.unix != max.unix:
+        # NOT Date.ceiling(), WHICH DOES NOT ALIGN WEEKS WITH floor()
+        end = end.add(interval)
+    if interval.month:
+        count = (_month(end) - _month(start)) // interval.month
+    else:
+        count = round((end.unix - start.unix) / interval.seconds)
+    return Data(interval=interval, min=start, max=end, count=count)
+
+
+def _month(date):
+    return month_from_days(split_unix(date.unix)[0] // 86400)
+
+
+# APPROXIMATE SIZE OF EACH INTERVAL, IN SECONDS, USING THE AVERAGE GREGORIAN MONTH
+_AVERAGE_MONTH = 365.2425 * 86400 / 12
+_intervals = tuple(sorted(COMMON_INTERVALS, key=lambda d: d.month * _AVERAGE_MONTH if d.month else d.seconds))
+_sizes = tuple(d.month * _AVERAGE_MONTH if d.month else d.seconds for d in _intervals)
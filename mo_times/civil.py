@@ -0,0 +1,117 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# INTEGER ARITHMETIC ON THE PROLEPTIC GREGORIAN CALENDAR
+# http://howardhinnant.github.io/date_algorithms.html
+#
+# days_from_civil(), civil_from_days() AND THE month FUNCTIONS ARE BRANCH-FREE,
+# SO THEY ALSO WORK ON numpy INTEGER ARRAYS
+#
+import math
+
+DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+EPOCH_MONTH = 1970 * 12  # MONTHS FROM YEAR ZERO TO EPOCH
+
+
+def is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def days_in_month(year, month):
+    if month == 2 and is_leap(year):
+        return 29
+    return DAYS_IN_MONTH[month]
+
+
+def days_from_civil(year, month, day):
+    """
+    RETURN NUMBER OF DAYS SINCE 1970-01-01
+    """
+    is_jan_feb = (14 - month) // 12
+    year = year - is_jan_feb
+    month = month + 12 * is_jan_feb - 3  # MARCH IS ZERO
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * month + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def civil_from_days(days):
+    """
+    RETURN (year, month, day) FOR NUMBER OF DAYS SINCE 1970-01-01
+    """
+    z = days + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153  # MARCH IS ZERO
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 - 12 * (mp // 10)
+    year = yoe + era * 400 + (14 - month) // 12
+    return year, month, day
+
+
+def month_from_days(days):
+    """
+    RETURN NUMBER OF MONTHS SINCE 1970-01 FOR NUMBER OF DAYS SINCE 1970-01-01
+    """
+    year, month, _ = civil_from_days(days)
+    return year * 12 + month - 1 - EPOCH_MONTH
+
+
+def days_from_month(months):
+    """
+    RETURN NUMBER OF DAYS SINCE 1970-01-01 TO THE FIRST OF THE GIVEN MONTHS SINCE 1970-01
+    """
+    months = months + EPOCH_MONTH
+    year = months // 12
+    return days_from_civil(year, months - year * 12 + 1, 1)
+
+
+def split_unix(unix):
+    """
+    RETURN (seconds, micro) AS int, ROUNDED TO THE MICROSECOND THE SAME WAY utcfromtimestamp() DOES
+    """
+    frac, whole = math.modf(unix)
+    whole = int(whole)
+    micro = round(frac * 1_000_000)
+    if micro >= 1_000_000:
+        return whole + 1, micro - 1_000_000
+    elif micro < 0:
+        return whole - 1, micro + 1_000_000
+    return whole, micro
+
+
+def join_unix(seconds, micro):
+    """
+    RETURN UNIX TIMESTAMP, ROUNDED THE SAME WAY timedelta.total_seconds() DOES
+    """
+    if micro:
+        return (seconds * 1_000_000 + micro) / 1_000_000
+    return float(seconds)
+
+
+def add_months(seconds, micro, months):
+    """
+    ADD CALENDAR MONTHS TO (seconds, micro), RETURN UNIX TIMESTAMP
+    THE LAST DAY OF A MONTH MAPS TO THE LAST DAY OF THE TARGET MONTH,
+    OTHER DAYS ARE CLAMPED TO THE TARGET MONTH LENGTH
+    """
+    days, time_of_day = divmod(seconds, 86400)
+    year, month, day = civil_from_days(days)
+    is_last_day = day == days_in_month(year, month)
+    target = int(month + months - 1)
+    target_year = year + target // 12
+    target_month = target % 12 + 1
+    target_length = days_in_month(target_year, target_month)
+    if is_last_day or day > target_length:
+        day = target_length
+    return join_unix(days_from_civil(target_year, target_month, day) * 86400 + time_of_day, micro)
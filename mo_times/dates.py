@@ -9,19 +9,36 @@
 #
 import math
 import re
-from datetime import date, datetime, timedelta
+from array import array
+from datetime import date, datetime
 from datetime import timezone
 from decimal import Decimal
+from operator import attrgetter
+from string import ascii_letters, digits
 from time import time as unix_now
 
 from mo_dots import Null, null_types, register_primitive
-from mo_future import utcnow as _utcnow, utcfromtimestamp, allocate_lock
+from mo_future import utcnow as _utcnow, utcfromtimestamp
 from mo_imports import delay_import
 from mo_math import is_integer
 
+from mo_times.civil import (
+    EPOCH_MONTH,
+    add_months,
+    civil_from_days,
+    days_from_civil,
+    days_from_month,
+    days_in_month,
+    join_unix,
+    month_from_days,
+    split_unix,
+)
 from mo_times.durations import Duration, MILLI_VALUES, YEAR
+from mo_times.formatter import _formatters, compile_format
+from mo_times.lru import LRU
 
 logger = delay_import("mo_logs.logger")
+DateRange = delay_import("mo_times.ranges.DateRange")
 
 
 ISO8601 = "%Y-%m-%dT%H:%M:%SZ"
@@ -31,6 +48,8 @@ DATE_EPOCH = date(1970, 1, 1)
 
 
 pytz = None
+NAN = float("nan")
+_get_unix = attrgetter("unix")
 
 
 class Date:
@@ -50,21 +69,13 @@ class Date:
             self.unix = parse(*args).unix
 
     def __hash__(self):
-        return self.unix.__hash__()
+        return hash(self.unix)
 
     def __eq__(self, other):
-        try:
-            type_ = other.__class__
-            if type_ in null_types:
-                return False
-            elif type_ is Date:
-                return self.unix == other.unix
-            elif type_ in (float, int):
-                return self.unix == other
-            other = Date(other)
+        if other.__class__ is Date:
             return self.unix == other.unix
-        except Exception:
-            return False
+        other = _comparable(other)
+        return other is not None and self.unix == other
 
     def __nonzero__(self):
         return True
@@ -77,7 +88,10 @@ class Date:
 
     def ceiling(self, duration=Null):
         if duration.month:
-            logger.error("do not know how to handle")
+            output = self.floor(duration)
+            if output.unix == self.unix:
+                return output
+            return output.add(duration)
 
         neg_self = _unix2Date(-self.unix)
         neg_floor = neg_self.floor(duration)
@@ -87,11 +101,10 @@ class Date:
         if duration is None:  # ASSUME DAY
             return _unix2Date(math.floor(self.unix / 86400) * 86400)
         elif duration.month:
-            dt = unix2datetime(self.unix)
-            month = int(math.floor((dt.year * 12 + dt.month - 1) / duration.month) * duration.month)
-            year = int(math.floor(month / 12))
-            month -= 12 * year
-            return Date(datetime(year, month + 1, 1))
+            seconds, _ = split_unix(self.unix)
+            month = month_from_days(seconds // 86400) + EPOCH_MONTH
+            month = int(math.floor(month / duration.month) * duration.month) - EPOCH_MONTH
+            return _unix2Date(float(days_from_month(month) * 86400))
         elif duration.milli % (7 * 86400000) == 0:
             offset = 4 * 86400
             return _unix2Date(math.floor((self.unix + offset) / duration.seconds) * duration.seconds - offset)
@@ -99,12 +112,10 @@ class Date:
             return _unix2Date(math.floor(self.unix / duration.seconds) * duration.seconds)
 
     def format(self, format="%Y-%m-%d %H:%M:%S"):
-        try:
-            return str(unix2datetime(self.unix).strftime(format))
-        except Exception as e:
-            logger.error(
-                "Can not format {value} with {format}", value=unix2datetime(self.unix), format=format, cause=e
-            )
+        formatter = _formatters.get(format)
+        if formatter is None:
+            formatter = compile_format(format)
+        return formatter(self.unix)
 
     strftime = format
 
@@ -135,10 +146,12 @@ class Date:
 
     @property
     def year(self):
-        return unix2datetime(self.unix).year
+        seconds, _ = split_unix(self.unix)
+        return civil_from_days(seconds // 86400)[0]
 
     def add_day(self):
-        return _unix2Date(datetime2unix(unix2datetime(self.unix) + timedelta(days=1)))
+        seconds, micro = split_unix(self.unix)
+        return _unix2Date(join_unix(seconds + 86400, micro))
 
     addDay = add_day
 
@@ -153,20 +166,8 @@ class Date:
             return Date(unix2datetime(self.unix) + other)
         elif isinstance(other, Duration):
             if other.month:
-                value = unix2datetime(self.unix)
-                if (value + timedelta(days=1)).month != value.month:
-                    # LAST DAY OF MONTH
-                    output = add_month(value + timedelta(days=1), other.month) - timedelta(days=1)
-                    return Date(output)
-                else:
-                    day = value.day
-                    num_days = (
-                        add_month(datetime(value.year, value.month, 1), other.month + 1) - timedelta(days=1)
-                    ).day
-                    day = min(day, num_days)
-                    curr = set_day(value, day)
-                    output = add_month(curr, other.month)
-                    return Date(output)
+                seconds, micro = split_unix(self.unix)
+                return _unix2Date(add_months(seconds, micro, other.month))
             else:
                 return _unix2Date(self.unix + other.seconds)
         else:
@@ -189,10 +190,70 @@ class Date:
 
     @staticmethod
     def range(min, max, interval):
-        v = min
-        while v < max:
-            yield v
-            v = v + interval
+        """
+        RETURN DateRange FROM min (INCLUSIVE) TO max (EXCLUSIVE), interval APART
+        """
+        return DateRange(min, max, interval)
+
+    # SORT KEY PROTOCOL: Date SORTS BY ITS unix ATTRIBUTE
+    sort_key = staticmethod(attrgetter("unix"))
+
+    @staticmethod
+    def sort(dates, reverse=False):
+        """
+        RETURN NEW LIST OF THE GIVEN Dates, SORTED; FASTER THAN sorted() BECAUSE Date.__lt__ IS NOT CALLED
+        """
+        return sorted(dates, key=_get_unix, reverse=reverse)
+
+    @staticmethod
+    def bisect_left(dates, value):
+        """
+        RETURN INDEX OF FIRST Date IN SORTED dates THAT IS NOT LESS THAN value
+        """
+        unix = _unix(value)
+        lo, hi = 0, len(dates)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if dates[mid].unix < unix:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    @staticmethod
+    def bisect(dates, value):
+        """
+        RETURN INDEX OF FIRST Date IN SORTED dates THAT IS GREATER THAN value
+        """
+        unix = _unix(value)
+        lo, hi = 0, len(dates)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if unix < dates[mid].unix:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    @staticmethod
+    def format_many(dates, format="%Y-%m-%d %H:%M:%S"):
+        """
+        RETURN LIST OF FORMATTED STRINGS (None FOR MISSING)
+        """
+        return compile_format(format).format_many(dates)
+
+    @staticmethod
+    def parse_many(values, format=None, as_date=False, failures=None):
+        """
+        PARSE A COLUMN OF STRINGS, EACH TO THE SAME RESULT AS Date(); THE FORMAT IS INFERRED ONCE
+        PER RUN OF ROWS WITH THE SAME SHAPE (DIGITS AND LETTERS MASKED), AND AGAIN WHEN IT STOPS WORKING
+        :param values: ITERABLE OF STRINGS (OTHER VALUES ARE CONVERTED AS Date() DOES; None AND Null ARE MISSING)
+        :param format: OPTIONAL strptime FORMAT USED FOR ALL VALUES (NO INFERENCE)
+        :param as_date: RETURN LIST OF Date (Null FOR FAILURES)
+        :param failures: OPTIONAL LIST TO RECEIVE (index, value) FOR EACH ROW THAT COULD NOT BE PARSED
+        :return: array("d") OF UNIX SECONDS (nan FOR FAILURES)
+        """
+        return parse_many(values, format=format, as_date=as_date, failures=failures)
 
     def to(self, timezone):
         """
@@ -217,60 +278,28 @@ class Date:
         return self.add(-other)
 
     def __lt__(self, other):
-        try:
-            type_ = other.__class__
-            if type_ in null_types:
-                return False
-            elif type_ is Date:
-                return self.unix < other.unix
-            elif type_ in (float, int):
-                return self.unix < other
-            other = Date(other)
+        if other.__class__ is Date:
             return self.unix < other.unix
-        except Exception:
-            return False
+        other = _comparable(other)
+        return other is not None and self.unix < other
 
     def __le__(self, other):
-        try:
-            type_ = other.__class__
-            if type_ in null_types:
-                return False
-            elif type_ is Date:
-                return self.unix <= other.unix
-            elif type_ in (float, int):
-                return self.unix <= other
-            other = Date(other)
+        if other.__class__ is Date:
             return self.unix <= other.unix
-        except Exception:
-            return False
+        other = _comparable(other)
+        return other is not None and self.unix <= other
 
     def __gt__(self, other):
-        try:
-            type_ = other.__class__
-            if type_ in null_types:
-                return False
-            elif type_ is Date:
-                return self.unix > other.unix
-            elif type_ in (float, int):
-                return self.unix > other
-            other = Date(other)
+        if other.__class__ is Date:
             return self.unix > other.unix
-        except Exception:
-            return False
+        other = _comparable(other)
+        return other is not None and self.unix > other
 
     def __ge__(self, other):
-        try:
-            type_ = other.__class__
-            if type_ in null_types:
-                return False
-            elif type_ is Date:
-                return self.unix >= other.unix
-            elif type_ in (float, int):
-                return self.unix >= other
-            other = Date(other)
+        if other.__class__ is Date:
             return self.unix >= other.unix
-        except Exception:
-            return False
+        other = _comparable(other)
+        return other is not None and self.unix >= other
 
     def __add__(self, other):
         return self.add(other)
@@ -356,6 +385,118 @@ def parse(*args):
         logger.error("Can not convert {args} to Date", args=args, cause=e)
 
 
+def parse_many(values, format=None, as_date=False, failures=None):
+    output = array("d")
+    append = output.append
+    if format:
+        hinted = _hinted(format)
+    shape, parser = None, None  # SHAPE OF THE LAST ROW INFERRED, AND THE PARSER THAT ACCEPTED IT
+
+    for i, value in enumerate(values):
+        if value is None or value.__class__ in null_types:
+            append(NAN)
+            continue
+        try:
+            if value.__class__ is not str:
+                # NUMBERS, datetime, Date, ... ARE CONVERTED THE SAME AS Date() DOES
+                unix = parse(value).unix
+            elif format:
+                value = value.strip()
+                unix = hinted(value)
+            else:
+                value = value.strip()
+                # ONLY ROWS OF THE SAME SHAPE SHARE A PARSER (AS IN _string2unix()), SO EVERY ROW PARSES
+                # AS Date() DOES; "20070202" AFTER A "20-01-2023" ROW IS STILL %Y%m%d
+                key = value.translate(_shape_table)
+                unix = None
+                if key == shape:
+                    try:
+                        unix = parser(value)
+                    except Exception:
+                        pass
+                if unix is None:
+                    unix, parser = _infer_parser(value)
+                    shape = key if parser is not None else None
+            append(unix)
+        except Exception:
+            append(NAN)
+            if failures is not None:
+                failures.append((i, value))
+
+    if as_date:
+        return [Null if u != u else _unix2Date(u) for u in output]
+    return output
+
+
+def _hinted(format):
+    """
+    RETURN PARSER FOR EXPLICIT format, WITH THE SAME MISSING-MILLI TOLERANCE AS unicode2Date
+    """
+    if format.endswith(".%f"):
+
+        def parse(value):
+            if "." not in value:
+                value += ".000"
+            return datetime2unix(datetime.strptime(value, format))
+
+        return parse
+    return _formatted(format)
+
+
+def _integer2unix(value):
+    if len(value) not in (9, 10, 12, 13) or not is_integer(value):
+        return None
+    unix = float(value)
+    if unix > 9999999999:  # WAY TOO BIG IF IT WAS A UNIX TIMESTAMP
+        return unix / 1000
+    return unix
+
+
+def _infer_parser(value):
+    """
+    RETURN (unix, parser) WHERE parser CAN BE USED ON OTHER VALUES OF THE SAME FORMAT
+    parser IS None WHEN value IS A RELATIVE EXPRESSION
+    """
+    unix = _iso2unix(value)
+    if unix is not None:
+        return unix, _iso2unix
+    unix = _integer2unix(value)
+    if unix is not None:
+        return unix, _integer2unix
+    lower = value.lower()
+    if any(n in lower for n in ["now", "today", "eod", "tomorrow"] + list(MILLI_VALUES.keys())):
+        return unicode2Date(value).unix, None
+    return _string2unix(value)
+
+
+def _comparable(other):
+    """
+    RETURN UNIX TIMESTAMP TO COMPARE A Date WITH, OR None IF other CAN NOT BE COMPARED
+    """
+    type_ = other.__class__
+    if type_ is float or type_ is int:
+        return other
+    elif type_ in null_types:
+        return None
+    elif type_ is str:
+        global _last_compared
+        text, unix = _last_compared
+        if text == other:
+            return unix
+        unix = _iso2unix(other.strip())
+        if unix is not None:
+            _last_compared = other, unix
+            return unix
+    try:
+        return Date(other).unix
+    except Exception:
+        return None
+
+
+# FILTERS COMPARE MANY Dates TO THE SAME STRING; REMEMBER THE LAST ISO STRING (RELATIVE ONES, LIKE "now", CHANGE)
+_last_compared = ("", None)
+
+
 def add_month(offset, months):
     month = int(offset.month + months - 1)
     year = offset.year
@@ -390,52 +531,117 @@ def set_day(offset, day):
     return output
 
 
-def parse_time_expression(value):
-    def simple_date(sign, dig, type, floor):
-        if dig or sign:
-            logger.error("can not accept a multiplier on a datetime")
+def parse_time_expression(value, now=None):
+    """
+    EVALUATE RELATIVE TIME EXPRESSION, LIKE "today-2week|week"
+    :param now: OPTIONAL REFERENCE TIME, SO MANY EXPRESSIONS CAN SEE THE SAME CLOCK
+    """
+    return compile_time_expression(value).evaluate(now)
 
-        if floor:
-            return Date(type).floor(Duration(floor))
-        else:
-            return Date(type)
 
-    terms = re.match(r"(\d*[|\w]+)\s*([+-]\s*\d*[|\w]+)*", value).groups()
+def compile_time_expression(value):
+    """
+    RETURN TimeExpression FOR value, CACHED BY SOURCE STRING
+    """
+    output = _expressions.get(value)
+    if output is None:
+        output = TimeExpression(value)
+        _expressions.set(value, output)
+    return output
 
-    sign, dig, type = re.match(r"([+-]?)\s*(\d*)([|\w]+)", terms[0]).groups()
-    if "|" in type:
-        type, floor = type.split("|")
-    else:
-        floor = None
 
-    if type in MILLI_VALUES.keys():
-        value = Duration(dig + type)
-    else:
-        value = simple_date(sign, dig, type, floor)
+class TimeExpression:
+    """
+    RELATIVE TIME EXPRESSION, COMPILED ONCE, EVALUATED MANY TIMES
+    <start>[|<floor>] FOLLOWED BY ANY NUMBER OF (+|-)<duration>[|<floor>]
+    A FLOOR APPLIES TO THE DATE ACCUMULATED SO FAR
+    """
 
-    for term in terms[1:]:
-        if not term:
-            continue
-        sign, dig, type = re.match(r"([+-])\s*(\d*)([|\w]+)", term).groups()
+    __slots__ = ["source", "start", "floor", "terms"]
+
+    def __init__(self, source):
+        self.source = source
+        first, rest = _expression_pattern.match(source).groups()
+        dig, type = _term_pattern.match(first).groups()
         if "|" in type:
             type, floor = type.split("|")
         else:
             floor = None
 
-        op = {"+": "__add__", "-": "__sub__"}[sign]
         if type in MILLI_VALUES.keys():
-            if floor:
-                logger.error("floor (|) of duration not accepted")
-            value = value.__getattribute__(op)(Duration(dig + type))
+            self.start = Duration(dig + type)
+            self.floor = None
+        else:
+            if dig:
+                logger.error("can not accept a multiplier on a datetime")
+            self.start = _relative_dates.get(type.lower()) or _constant_date(type)
+            self.floor = Duration(floor) if floor else None
+
+        terms = []
+        for sign, dig, type in _signed_term_pattern.findall(rest or ""):
+            if "|" in type:
+                if isinstance(self.start, Duration):
+                    logger.error("floor (|) of duration not accepted")
+                type, floor = type.split("|")
+                floor = Duration(floor)
+            else:
+                floor = None
+            if type not in MILLI_VALUES.keys():
+                logger.error("can not accept a multiplier on a datetime")
+            duration = Duration(dig + type)
+            terms.append((duration if sign == "+" else -duration, floor))
+        self.terms = tuple(terms)
+
+    def evaluate(self, now=None):
+        """
+        :param now: REFERENCE TIME (Date, OR UNIX SECONDS); DEFAULT IS THE CLOCK, READ ONCE
+        :return: Date, OR Duration IF THE EXPRESSION STARTS WITH A DURATION
+        """
+        start = self.start
+        if isinstance(start, Duration):
+            value = start
         else:
-            value = value.__getattribute__(op)(simple_date(sign, dig, type, floor))
+            if now is None:
+                now = unix_now()
+            elif now.__class__ is not float:
+                now = Date(now).unix
+            value = start(now)
+            if self.floor:
+                value = value.floor(self.floor)
+        for term, floor in self.terms:
+            value = value + term
+            if floor:
+                value = value.floor(floor)
+        return value
+
+    __call__ = evaluate
+
+    def __repr__(self):
+        return f"TimeExpression({self.source!r})"
+
 
-    return value
+def _constant_date(type):
+    def _date(now):
+        return Date(type)
+
+    return _date
+
+
+_relative_dates = {
+    "now": lambda now: _unix2Date(now),
+    "today": lambda now: _unix2Date(math.floor(now / 86400) * 86400),
+    "eod": lambda now: _unix2Date(math.floor(now / 86400) * 86400 + 86400),
+    "tomorrow": lambda now: _unix2Date(math.floor(now / 86400) * 86400 + 86400),
+}
+_expression_pattern = re.compile(r"(\d*[|\w]+)\s*((?:[+-]\s*\d*[|\w]+\s*)*)")
+_term_pattern = re.compile(r"(\d*)([|\w]+)")
+_signed_term_pattern = re.compile(r"([+-])\s*(\d*)([|\w]+)")
+_expressions = LRU(1000)
 
 
 def _formatted(format):
     def _parse(value):
-        return _unix2Date(datetime2unix(datetime.strptime(value, format)))
+        return datetime2unix(datetime.strptime(value, format))
 
     setattr(_parse, "format", format)
     return _parse
@@ -448,9 +654,9 @@ def _deformatted(format):
             norm = deformat(value.strip())
             if "|" not in norm:
                 compact_format = format.replace("|", "")
-                return _unix2Date(datetime2unix(datetime.strptime(norm, compact_format)))
+                return datetime2unix(datetime.strptime(norm, compact_format))
 
-            return _unix2Date(datetime2unix(datetime.strptime(norm, format)))
+            return datetime2unix(datetime.strptime(norm, format))
 
         setattr(parse, "format", format)
         return parse
@@ -465,9 +671,9 @@ def _deformatted(format):
             candidate = datetime.strptime(year + norm, "%Y" + format.replace("|", ""))
         candidate = _unix2Date(datetime2unix(candidate.replace(tzinfo=timezone.utc)))
         if candidate > now:
-            return candidate - YEAR
+            return (candidate - YEAR).unix
         else:
-            return candidate
+            return candidate.unix
 
     setattr(sans_year, "format", format)
     return sans_year
@@ -507,8 +713,14 @@ _deformats = [
     "%d|%B|%y|%H|%M|%S",
     "%Y|%m|%d|%H|%M|%S|%f",
 ]
-attempts_locker = allocate_lock()
-attempts = [*(_formatted(f) for f in _datetime_formats), *(_deformatted(f) for f in _deformats)]
+# IMMUTABLE; LEARNING A NEW ORDER REPLACES THE WHOLE TUPLE, SO READERS NEED NO LOCK
+attempts = (*(_formatted(f) for f in _datetime_formats), *(_deformatted(f) for f in _deformats))
+
+# DIGITS BECOME 9, LETTERS BECOME a, EVERYTHING ELSE IS KEPT
+_shape_table = str.maketrans(digits + ascii_letters, "9" * len(digits) + "a" * len(ascii_letters))
+_shape_parsers = {}  # MAP FROM SHAPE TO THE PARSER THAT LAST ACCEPTED IT
+MAX_SHAPES = 1000
+_parse_cache = None  # OPTIONAL LRU OF string -> Date, SEE cache_parsing()
 
 
 def unicode2Date(value, format=None):
@@ -527,7 +739,21 @@ def unicode2Date(value, format=None):
         except Exception as e:
             logger.error("Can not format {value} with {format}", value=value, format=format, cause=e)
 
+    cache = _parse_cache
+    if cache is not None:
+        output = cache.get(value)
+        if output is not None:
+            return output
+        key = value
+
     value = value.strip()
+    unix = _iso2unix(value)
+    if unix is not None:
+        output = _unix2Date(unix)
+        if cache is not None:
+            cache.set(key, output)
+        return output
+
     if value.lower() == "now":
         return _unix2Date(datetime2unix(_utcnow()))
     elif value.lower() == "today":
@@ -538,17 +764,101 @@ def unicode2Date(value, format=None):
     if any(n in value.lower() for n in ["now", "today", "eod", "tomorrow"] + list(MILLI_VALUES.keys())):
         return parse_time_expression(value)
 
-    with attempts_locker:
-        for f in attempts:
-            try:
-                result = f(value)
-                attempts.remove(f)
-                attempts.insert(0, f)
-                return result
-            except Exception:
-                pass
-        else:
-            logger.error("Can not interpret {value} as a datetime", value=value)
+    unix, parser = _string2unix(value)
+    output = _unix2Date(unix)
+    if cache is not None and "%y" in parser.format.lower():
+        # FORMATS WITHOUT YEAR DEPEND ON THE CLOCK, SO ARE NOT CACHED
+        cache.set(key, output)
+    return output
+
+
+def cache_parsing(capacity=10_000):
+    """
+    CACHE THE Date FOR EACH ABSOLUTE DATE STRING PARSED; RELATIVE EXPRESSIONS ("now", "today-week", ...) ARE NOT CACHED
+    :param capacity: MAXIMUM NUMBER OF STRINGS REMEMBERED; ZERO TURNS CACHING OFF
+    :return: THE LRU CACHE (FOR hits AND misses), OR None
+    """
+    global _parse_cache
+
+    _parse_cache = LRU(capacity) if capacity else None
+    return _parse_cache
+
+
+_iso_pattern = re.compile(
+    r"(\d{4})-(\d\d)-(\d\d)(?:([Tt ])(\d\d):(\d\d):(\d\d)(?:\.(\d{1,6}))?(?:(Z)|([+-])(\d\d):?(\d\d))?)?$", re.ASCII
+)
+
+
+def _iso2unix(value):
+    """
+    FAST PATH FOR ISO8601 (RFC3339) STRINGS, DIRECTLY TO UNIX TIMESTAMP
+    RETURN None IF value IS NOT ISO, OR NOT ACCEPTED BY THE strptime PATH
+    """
+    match = _iso_pattern.match(value)
+    if match is None:
+        return None
+    year, month, day, sep, hour, minute, second, fraction, zulu, sign, off_hour, off_minute = match.groups()
+    year, month, day = int(year), int(month), int(day)
+    if not year or not 1 <= month <= 12 or not 1 <= day <= days_in_month(year, month):
+        return None
+    seconds = days_from_civil(year, month, day) * 86400
+    if sep is None:
+        return float(seconds)
+
+    hour, minute, second = int(hour), int(minute), int(second)
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+    seconds += hour * 3600 + minute * 60 + second
+    if sign:
+        if sep == " ":
+            return None
+        off_hour, off_minute = int(off_hour), int(off_minute)
+        if off_hour > 23 or off_minute > 59:
+            return None
+        offset = off_hour * 3600 + off_minute * 60
+        seconds = seconds - offset if sign == "+" else seconds + offset
+    elif zulu and sep == " ":
+        return None
+    if fraction:
+        # SAME ROUNDING AS timedelta.total_seconds()
+        return (seconds * 1000000 + int(fraction.ljust(6, "0"))) / 1000000
+    return float(seconds)
+
+
+def _string2unix(value):
+    """
+    CONVERT ABSOLUTE DATE STRING TO (unix, parser) WHERE parser ACCEPTED value
+    THE SHAPE OF value IS USED TO GO STRAIGHT TO THE PARSER THAT ACCEPTED THE SAME SHAPE BEFORE
+    """
+    global attempts
+
+    key = value.translate(_shape_table)
+    known = _shape_parsers.get(key)
+    if known is not None:
+        try:
+            return known(value), known
+        except Exception:
+            pass
+
+    current = attempts
+    for f in current:
+        if f is known:
+            continue
+        try:
+            result = f(value)
+            break
+        except Exception:
+            pass
+    else:
+        logger.error("Can not interpret {value} as a datetime", value=value)
+
+    if current[0] is not f:
+        # MOVE TO FRONT; A CONCURRENT LEARNER MAY WIN, WHICH ONLY COSTS A FUTURE SCAN
+        attempts = (f, *(a for a in current if a is not f))
+    if len(_shape_parsers) >= MAX_SHAPES:
+        _shape_parsers.clear()
+    _shape_parsers[key] = f
+    return result, f
 
 
 def datetime2unix(value):
@@ -591,6 +901,23 @@ def _unix2Date(unix):
     return output
 
 
+def _unix(value):
+    """
+    RETURN unix SECONDS OF value (ANYTHING Date() ACCEPTS), WITHOUT MAKING A Date WHEN POSSIBLE
+    RETURN None FOR MISSING VALUES (None, Null, nan); CALLERS DECIDE IF THAT IS AN ERROR
+    """
+    if value is None or value.__class__ in null_types:
+        return None
+    elif value.__class__ is Date:
+        return value.unix
+    elif value.__class__ is float:
+        if value != value:
+            return None
+        if value <= 9999999999:  # LARGER IS MILLISECONDS, WHICH Date() CONVERTS
+            return value
+    return Date(value).unix
+
+
 _non_alpha_num = re.compile(r"[^a-zA-Z0-9]+")
 
 
@@ -24,6 +24,12 @@ class Duration:
     __slots__ = ["_milli", "month"]
 
     def __new__(cls, value=None, **kwargs):
+        if value.__class__ is str:
+            output = _parsed.get(value)
+            if output is None:
+                output = parse(value)
+            return output
+
         output = object.__new__(cls)
         if value == None:
             if kwargs:
@@ -318,7 +324,7 @@ def _string2Duration(text):
     if text == "" or text == "zero":
         return ZERO
 
-    amount, interval = re.match(r"([\d.]*)(\w*)", text).groups()
+    amount, interval = _term.match(text).groups()
     amount = int(amount) if amount else 1
 
     if interval not in MILLI_VALUES:
@@ -340,18 +346,41 @@ def _string2Duration(text):
 
 
 def parse(value):
-    output = Duration(0)
+    """
+    RETURN Duration FOR value; THE SAME INSTANCE IS RETURNED FOR THE SAME STRING, SO DO NOT MODIFY IT
+    """
+    output = _parsed.get(value)
+    if output is not None:
+        return output
 
     # EXPECTING CONCAT OF <sign><integer><type>
-    plist = value.split("+")
-    for p, pplist in enumerate(plist):
+    milli, month = 0.0, 0
+    for pplist in value.split("+"):
         mlist = pplist.split("-")
-        output = output + _string2Duration(mlist[0])
+        term = _string2Duration(mlist[0])
+        milli += term.milli
+        month += term.month
         for m in mlist[1::]:
-            output = output - _string2Duration(m)
+            term = _string2Duration(m)
+            milli -= term.milli
+            month -= term.month
+
+    output = object.__new__(Duration)
+    output.milli = milli
+    output.month = month
+    if len(_parsed) >= MAX_PARSED:
+        _parsed.clear()
+        _parsed.update(_pinned)
+    _parsed[value] = output
     return output
 
 
+_term = re.compile(r"([\d.]*)(\w*)")
+_parsed = {}  # FLYWEIGHT CACHE OF PARSED STRINGS
+_pinned = {}  # MODULE CONSTANTS, PUT BACK WHENEVER _parsed IS CLEARED
+MAX_PARSED = 10_000
+
+
 MILLI_VALUES = dict_to_data({
     "year": float(52 * 7 * 24 * 60 * 60 * 1000),  # 52weeks
     "quarter": float(13 * 7 * 24 * 60 * 60 * 1000),  # 13weeks
@@ -420,3 +449,5 @@ COMMON_INTERVALS = [
     Duration("6month"),
     Duration("year"),
 ]
+# EVERYTHING PARSED SO FAR IS A MODULE CONSTANT, AND MUST STAY THE SAME INSTANCE
+_pinned.update(_parsed)
@@ -0,0 +1,204 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# EXPORT REGISTRY Timer MEASUREMENTS TO METRICS SYSTEMS
+#
+# PROMETHEUS SCRAPES A TEXT PAGE, RENDERED FROM THE REGISTRY WHEN ASKED
+# STATSD GETS UDP PACKETS; THE Timer ONLY APPENDS TO A deque, AND A BACKGROUND
+# THREAD SENDS THEM IN BATCHES
+#
+import re
+import socket
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mo_imports import delay_import
+
+from mo_times.durations import Duration, SECOND
+from mo_times.registry import REGISTRY
+
+logger = delay_import("mo_logs.logger")
+
+# UPPER BOUNDS (SECONDS) OF THE PROMETHEUS HISTOGRAM BUCKETS (THE CLIENT LIBRARY DEFAULTS)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+MAX_PACKET = 1432  # LARGEST UDP PAYLOAD THAT FITS A 1500 BYTE ETHERNET FRAME
+
+
+def prometheus(registry=REGISTRY, metric="timer_seconds", buckets=DEFAULT_BUCKETS):
+    """
+    RETURN THE registry TIMERS IN PROMETHEUS TEXT FORMAT, AS ONE HISTOGRAM metric,
+    WITH THE Timer NAME IN THE name LABEL
+    THE COUNTS ARE CUMULATIVE, SO DO NOT reset() A registry THAT IS SCRAPED
+    """
+    output = [f"# HELP {metric} Duration of mo_times Timers", f"# TYPE {metric} histogram"]
+    bounds = [_number(b) for b in buckets]
+    for name, histogram in registry.histograms().items():
+        label = f'name="{_escape(name)}"'
+        for bound, count in zip(bounds, histogram.cumulative(buckets)):
+            output.append(f'{metric}_bucket{{{label},le="{bound}"}} {count}')
+        output.append(f'{metric}_bucket{{{label},le="+Inf"}} {histogram.count}')
+        output.append(f"{metric}_sum{{{label}}} {_number(histogram.total)}")
+        output.append(f"{metric}_count{{{label}}} {histogram.count}")
+    return "\n".join(output) + "\n"
+
+
+class PrometheusHandler(BaseHTTPRequestHandler):
+    """
+    SERVE prometheus() AT /metrics
+    """
+
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        content = prometheus(self.registry).encode("utf8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        # SCRAPES ARE FREQUENT; DO NOT WRITE EACH ONE TO stderr
+        pass
+
+
+def start_prometheus(port=9100, host="", registry=REGISTRY):
+    """
+    SERVE /metrics FROM A DAEMON THREAD
+    RETURN THE SERVER; CALL shutdown() AND server_close() TO STOP IT
+    """
+    handler = type("PrometheusHandler", (PrometheusHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="prometheus exporter", daemon=True).start()
+    return server
+
+
+class StatsD:
+    """
+    SEND EVERY registry MEASUREMENT TO STATSD, AS A TIMING (|ms) OVER UDP
+
+    THE Timer ONLY APPENDS TO A deque; EVERY interval A BACKGROUND THREAD PACKS
+    THE QUEUE INTO PACKETS OF UP TO max_packet BYTES. WHEN max_queue MEASUREMENTS
+    ARE WAITING, NEW ONES ARE DROPPED (AND COUNTED), RATHER THAN BLOCK
+    """
+
+    def __init__(
+        self,
+        host="localhost",
+        port=8125,
+        prefix="",
+        interval=SECOND,
+        max_queue=100_000,
+        max_packet=MAX_PACKET,
+        registry=REGISTRY,
+    ):
+        self.address = (host, port)
+        self.prefix = prefix
+        self.interval = Duration(interval).seconds
+        self.max_queue = max_queue
+        self.max_packet = max_packet
+        self.registry = registry
+        self.queue = deque()
+        self.dropped = 0  # MEASUREMENTS NOT QUEUED, BECAUSE THE QUEUE WAS FULL
+        self.failed = 0  # PACKETS THE SOCKET WOULD NOT SEND
+        self.socket = None
+        self.thread = None
+        self.please_stop = None
+
+    def record(self, name, seconds):
+        """
+        QUEUE ONE MEASUREMENT (CALLED BY THE registry)
+        """
+        queue = self.queue
+        if len(queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        queue.append((name, seconds))
+
+    def start(self):
+        if self.thread:
+            return self
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+        self.please_stop = threading.Event()
+        self.thread = threading.Thread(target=self._worker, name="statsd exporter", daemon=True)
+        self.thread.start()
+        self.registry.add_listener(self.record)
+        return self
+
+    def stop(self):
+        """
+        STOP LISTENING, SEND WHAT IS QUEUED, AND CLOSE THE SOCKET
+        """
+        if not self.thread:
+            return
+        self.registry.remove_listener(self.record)
+        self.please_stop.set()
+        self.thread.join()
+        self.thread = None
+        self.socket.close()
+        self.socket = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _worker(self):
+        please_stop = self.please_stop
+        while not please_stop.wait(self.interval):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        """
+        SEND ALL QUEUED MEASUREMENTS
+        """
+        for packet in self._packets():
+            try:
+                self.socket.sendto(packet, self.address)
+            except OSError as cause:
+                # BUFFER FULL, OR NOBODY LISTENING; STATSD IS BEST-EFFORT
+                self.failed += 1
+                if self.failed == 1:
+                    logger.warning("Can not send to statsd at {{address}}", address=self.address, cause=cause)
+
+    def _packets(self):
+        queue, prefix, max_packet = self.queue, self.prefix, self.max_packet
+        lines, size = [], 0
+        while queue:
+            name, seconds = queue.popleft()
+            line = f"{prefix}{_statsd_name(name)}:{_number(round(seconds * 1000, 3))}|ms".encode("utf8")
+            if lines and size + 1 + len(line) > max_packet:
+                yield b"\n".join(lines)
+                lines, size = [], 0
+            size += len(line) + (1 if lines else 0)
+            lines.append(line)
+        if lines:
+            yield b"\n".join(lines)
+
+
+def _escape(label):
+    return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _statsd_name(name, _bad=re.compile(r"[:|@\s]")):
+    return _bad.sub("_", name)
+
+
+def _number(value):
+    # repr() IS THE SHORTEST TEXT THAT READS BACK AS THE SAME float
+    return repr(float(value))
@@ -0,0 +1,264 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# strftime() FORMATS, COMPILED ONCE INTO A printf TEMPLATE THAT IS FILLED
+# FROM INTEGER CALENDAR FIELDS, WITHOUT MAKING A datetime
+#
+import re
+from datetime import datetime
+from operator import itemgetter
+
+from mo_dots import list_to_data, null_types
+from mo_future import utcfromtimestamp
+from mo_imports import delay_import
+
+from mo_times.civil import civil_from_days, days_from_civil, split_unix
+
+Date = delay_import("mo_times.Date")
+logger = delay_import("mo_logs.logger")
+
+# FIELDS, IN THE ORDER THEY ARE COMPUTED
+_Y, _m, _d, _H, _M, _S = range(6)  # CORE FIELDS
+_a, _A, _b, _B, _j, _p, _I, _y, _w = range(6, 15)  # EXTRA FIELDS
+
+# DIRECTIVE -> (FIELD, printf CONVERSION)
+DIRECTIVES = {
+    "Y": (_Y, "%s"),
+    "m": (_m, "%s"),
+    "d": (_d, "%s"),
+    "H": (_H, "%s"),
+    "M": (_M, "%s"),
+    "S": (_S, "%s"),
+    "a": (_a, "%s"),
+    "A": (_A, "%s"),
+    "b": (_b, "%s"),
+    "B": (_B, "%s"),
+    "j": (_j, "%03d"),
+    "p": (_p, "%s"),
+    "I": (_I, "%s"),
+    "y": (_y, "%s"),
+    "w": (_w, "%d"),
+}
+# Date IS ALWAYS GMT
+CONSTANTS = {"Z": "UTC", "z": "+0000"}
+# printf IS SLOW; TWO-DIGIT FIELDS ARE LOOKED UP
+TWO_DIGITS = tuple(f"{i:02d}" for i in range(100))
+
+_directive = re.compile(r"%(.?)")
+_formatters = {}
+MAX_FORMATTERS = 1000
+
+
+class Formatter:
+    """
+    A strftime() FORMAT, COMPILED
+    OUTPUT MATCHES unix2datetime(unix).strftime(format) FOR YEARS 1000 TO 9999 (SO %Y IS ALWAYS FOUR DIGITS)
+    FORMATS WITH OTHER DIRECTIVES USE strftime()
+
+    THE TEXT FOR THE MOST RECENT SECOND IS CACHED; FOR FORMATS WITH %f THE
+    CACHED TEXT IS A TEMPLATE THAT ONLY NEEDS THE MICROSECONDS FILLED IN
+    hits AND misses COUNT CACHE USE (APPROXIMATE WHEN SHARED BY THREADS)
+    """
+
+    __slots__ = ["format", "template", "pick", "extra", "names", "micro", "last", "hits", "misses"]
+
+    def __init__(self, format):
+        self.format = format
+        self.template = None  # None MEANS USE strftime()
+        self.pick = None
+        self.extra = False
+        self.names = None
+        self.micro = 0  # NUMBER OF %f IN FORMAT
+        self.last = (None, None)  # (seconds, text)
+        self.hits = 0
+        self.misses = 0
+
+        tokens = []
+        end = 0
+        for match in _directive.finditer(format):
+            code = match.group(1)
+            if code != "%" and code != "f" and code not in CONSTANTS and code not in DIRECTIVES:
+                return
+            tokens.append((format[end : match.start()], code))
+            end = match.end()
+        tokens.append((format[end:], None))
+
+        # WITH %f THE CACHED TEXT IS A TEMPLATE TOO, SO LITERAL % IS ESCAPED TWICE
+        num_micro = sum(1 for _, code in tokens if code == "f")
+        percent = "%%%%" if num_micro else "%%"
+
+        template = []
+        fields = []
+        for literal, code in tokens:
+            template.append(literal.replace("%", percent))
+            if code is None:
+                continue
+            elif code == "%":
+                template.append(percent)
+            elif code == "f":
+                template.append("%%06d")
+            elif code in CONSTANTS:
+                template.append(CONSTANTS[code])
+            else:
+                field, conversion = DIRECTIVES[code]
+                template.append(conversion)
+                fields.append(field)
+
+        self.template = "".join(template)
+        if not fields:
+            self.pick = lambda values: ()
+        elif len(fields) == 1:
+            field = fields[0]
+            self.pick = lambda values: (values[field],)
+        else:
+            self.pick = itemgetter(*fields)
+        self.extra = any(f > _S for f in fields)
+        if self.extra:
+            self.names = _locale_names()
+        self.micro = num_micro
+
+    def __call__(self, unix):
+        """
+        RETURN unix FORMATTED
+        """
+        if self.template is None:
+            return self._strftime(unix)
+        try:
+            seconds, micro = split_unix(unix)
+        except Exception:
+            return self._strftime(unix)
+
+        last_seconds, text = self.last
+        if last_seconds == seconds:
+            self.hits += 1
+        else:
+            self.misses += 1
+            text = self._format_second(seconds)
+            if text is None:
+                return self._strftime(unix)
+            self.last = (seconds, text)
+
+        if not self.micro:
+            return text
+        elif self.micro == 1:
+            return text % micro
+        return text % ((micro,) * self.micro)
+
+    def _format_second(self, seconds):
+        """
+        RETURN TEXT FOR THE GIVEN WHOLE SECOND, OR None IF OUT OF RANGE
+        """
+        days, time_of_day = divmod(seconds, 86400)
+        year, month, day = civil_from_days(days)
+        if not 1000 <= year <= 9999:
+            return None
+        hour, time_of_day = divmod(time_of_day, 3600)
+        minute, second = divmod(time_of_day, 60)
+        values = (
+            str(year),
+            TWO_DIGITS[month],
+            TWO_DIGITS[day],
+            TWO_DIGITS[hour],
+            TWO_DIGITS[minute],
+            TWO_DIGITS[second],
+        )
+        if self.extra:
+            values += _extra_fields(self.names, days, year, month, day, hour)
+        return self.template % self.pick(values)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def format_many(self, values):
+        """
+        RETURN LIST OF STRINGS (None FOR MISSING)
+        values - Date, OR unix TIMESTAMPS
+        """
+        output = []
+        append = output.append
+        for v in values:
+            if v is None or v.__class__ in null_types:
+                append(None)
+                continue
+            unix = v if v.__class__ is float else getattr(v, "unix", None)
+            if unix is None:
+                unix = Date(v).unix
+            if unix != unix:
+                append(None)
+            else:
+                append(self(unix))
+        return output
+
+    def _strftime(self, unix):
+        try:
+            return str(utcfromtimestamp(unix).strftime(self.format))
+        except Exception as e:
+            logger.error("Can not format {value} with {format}", value=unix, format=self.format, cause=e)
+
+
+def compile_format(format):
+    """
+    RETURN Formatter FOR THE GIVEN strftime() FORMAT, COMPILED ONCE PER FORMAT
+    """
+    output = _formatters.get(format)
+    if output is None:
+        output = Formatter(format)
+        if len(_formatters) >= MAX_FORMATTERS:
+            _formatters.clear()
+        _formatters[format] = output
+    return output
+
+
+def cache_stats():
+    """
+    RETURN LIST OF {format, hits, misses, hit_rate}, ONE FOR EACH COMPILED FORMAT
+    """
+    return list_to_data([
+        {"format": f.format, "hits": f.hits, "misses": f.misses, "hit_rate": f.hit_rate} for f in _formatters.values()
+    ])
+
+
+def format_many(dates, format="%Y-%m-%d %H:%M:%S"):
+    """
+    RETURN LIST OF FORMATTED STRINGS (None FOR MISSING)
+    """
+    return compile_format(format).format_many(dates)
+
+
+def _extra_fields(names, days, year, month, day, hour):
+    weekday = (days + 3) % 7  # MONDAY IS ZERO, 1970-01-01 WAS A THURSDAY
+    short_days, long_days, short_months, long_months, am_pm = names
+    return (
+        short_days[weekday],
+        long_days[weekday],
+        short_months[month],
+        long_months[month],
+        days - days_from_civil(year, 1, 1) + 1,
+        am_pm[hour >= 12],
+        TWO_DIGITS[hour % 12 or 12],
+        TWO_DIGITS[year % 100],
+        (weekday + 1) % 7,  # SUNDAY IS ZERO
+    )
+
+
+def _locale_names():
+    """
+    DAY AND MONTH NAMES, AS strftime() WOULD SHOW THEM IN THE CURRENT LOCALE
+    """
+    days = [datetime(2024, 1, d) for d in range(1, 8)]  # 2024-01-01 WAS A MONDAY
+    months = [datetime(2024, m, 1) for m in range(1, 13)]
+    return (
+        tuple(d.strftime("%a") for d in days),
+        tuple(d.strftime("%A") for d in days),
+        (None,) + tuple(m.strftime("%b") for m in months),
+        (None,) + tuple(m.strftime("%B") for m in months),
+        (datetime(2024, 1, 1, 0).strftime("%p"), datetime(2024, 1, 1, 12).strftime("%p")),
+    )
@@ -0,0 +1,160 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from array import array
+from heapq import heappop, heappush
+
+from mo_imports import delay_import
+
+from mo_times.dates import Date, _unix
+from mo_times.durations import Duration
+
+logger = delay_import("mo_logs.logger")
+
+
+class TimeInterval:
+    """
+    IMMUTABLE RANGE OF TIME, min <= value < max
+    """
+
+    __slots__ = ["min", "max"]
+
+    def __init__(self, min, max):
+        min = Date(min)
+        max = min.add(max) if isinstance(max, Duration) else Date(max)
+        if max < min:
+            logger.error("Expecting min <= max, not {min} > {max}", min=min, max=max)
+        object.__setattr__(self, "min", min)
+        object.__setattr__(self, "max", max)
+
+    def __setattr__(self, key, value):
+        logger.error("TimeInterval is immutable")
+
+    @property
+    def duration(self):
+        return self.max - self.min
+
+    def __contains__(self, value):
+        unix = _unix(value)
+        if unix is None:
+            return False
+        return self.min.unix <= unix < self.max.unix
+
+    def overlaps(self, other):
+        """
+        RETURN True IF THE INTERVALS SHARE ANY TIME
+        """
+        return self.min.unix < other.max.unix and other.min.unix < self.max.unix
+
+    def __eq__(self, other):
+        if isinstance(other, TimeInterval):
+            return self.min.unix == other.min.unix and self.max.unix == other.max.unix
+        return False
+
+    def __hash__(self):
+        return hash((self.min.unix, self.max.unix))
+
+    def __repr__(self):
+        return f"TimeInterval({self.min}, {self.max})"
+
+
+class IntervalIndex:
+    """
+    STATIC INTERVAL TREE OVER MANY TimeIntervals
+    INTERVALS ARE SORTED BY min; THE TREE IS IMPLICIT (THE MIDDLE OF EACH RANGE IS
+    ITS ROOT), AND EACH ROOT REMEMBERS THE LARGEST max IN ITS SUBTREE, SO QUERIES
+    COST O(log(n) + k) FOR k RESULTS
+    """
+
+    __slots__ = ["intervals", "starts", "ends", "subtree_max"]
+
+    def __init__(self, intervals=None):
+        intervals = [i if isinstance(i, TimeInterval) else TimeInterval(*i) for i in intervals or []]
+        intervals.sort(key=lambda i: (i.min.unix, i.max.unix))
+        self.intervals = intervals
+        self.starts = array("d", (i.min.unix for i in intervals))
+        self.ends = array("d", (i.max.unix for i in intervals))
+        self.subtree_max = array("d", self.ends)
+        self._build(0, len(intervals))
+
+    def _build(self, lo, hi):
+        if lo >= hi:
+            return float("-inf")
+        mid = (lo + hi) // 2
+        largest = max(self.ends[mid], self._build(lo, mid), self._build(mid + 1, hi))
+        self.subtree_max[mid] = largest
+        return largest
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def __iter__(self):
+        return iter(self.intervals)
+
+    def stab(self, date):
+        """
+        RETURN LIST OF INTERVALS THAT CONTAIN date (IN ORDER OF min)
+        """
+        unix = _unix(date)
+        if unix is None:
+            return []
+        return self._search(unix, unix, True)
+
+    def overlap(self, min, max):
+        """
+        RETURN LIST OF INTERVALS THAT SHARE ANY TIME WITH [min, max) (IN ORDER OF min)
+        """
+        interval = TimeInterval(min, max)
+        return self._search(interval.min.unix, interval.max.unix, False)
+
+    def _search(self, low, high, inclusive):
+        """
+        FIND INTERVALS WITH max > low AND min < high (OR min <= high IF inclusive)
+        """
+        starts, ends, subtree_max, intervals = self.starts, self.ends, self.subtree_max, self.intervals
+        output = []
+        todo = [(0, len(starts))]
+        while todo:
+            lo, hi = todo.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if subtree_max[mid] <= low:
+                continue  # EVERYTHING IN THIS SUBTREE ENDS TOO EARLY
+            start = starts[mid]
+            if start < high or (inclusive and start == high):
+                todo.append((mid + 1, hi))
+                if ends[mid] > low:
+                    output.append(mid)
+            todo.append((lo, mid))
+        output.sort()
+        return [intervals[i] for i in output]
+
+    def stab_many(self, dates):
+        """
+        RETURN, FOR EACH OF dates, THE LIST OF INTERVALS THAT CONTAIN IT
+        SWEEPS dates IN TIME ORDER, SO COST IS O((n + m) log(n) + k)
+        """
+        unix = [_unix(d) for d in dates]
+        order = sorted((i for i, u in enumerate(unix) if u is not None), key=unix.__getitem__)
+        starts, ends, intervals = self.starts, self.ends, self.intervals
+
+        output = [[] for _ in unix]
+        active = []  # HEAP OF (end, index)
+        next_interval = 0
+        num_intervals = len(starts)
+        for i in order:
+            u = unix[i]
+            while next_interval < num_intervals and starts[next_interval] <= u:
+                heappush(active, (ends[next_interval], next_interval))
+                next_interval += 1
+            while active and active[0][0] <= u:
+                heappop(active)
+            output[i] = [intervals[j] for j in sorted(j for _, j in active)]
+        return output
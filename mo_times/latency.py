@@ -0,0 +1,202 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# LOG-LINEAR LATENCY HISTOGRAM, LIKE HdrHistogram
+# http://hdrhistogram.org/
+#
+# VALUES ARE COUNTED IN unit-SIZED STEPS; SMALL VALUES ARE COUNTED EXACTLY, AND
+# EACH POWER OF TWO ABOVE THAT IS SPLIT INTO THE SAME NUMBER OF LINEAR BUCKETS,
+# SO EVERY VALUE IS KEPT TO WITHIN THE REQUESTED NUMBER OF SIGNIFICANT DIGITS
+#
+import math
+from array import array
+
+from mo_dots import Data
+from mo_imports import delay_import
+
+logger = delay_import("mo_logs.logger")
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """
+    FIXED-MEMORY HISTOGRAM OF DURATIONS (IN SECONDS)
+    highest - LARGEST DURATION TRACKED (LARGER ONES ARE COUNTED AS highest, BUT max IS EXACT)
+    digits - SIGNIFICANT DECIMAL DIGITS KEPT
+    unit - SMALLEST DURATION DISTINGUISHED
+    """
+
+    __slots__ = ["highest", "digits", "unit", "_scale", "_bits", "_half", "_limit", "counts", "count", "total", "max"]
+
+    def __init__(self, highest=3600, digits=2, unit=0.000_001):
+        if not 1 <= digits <= 5:
+            logger.error("Expecting 1 to 5 significant digits, not {digits}", digits=digits)
+        self.highest = highest
+        self.digits = digits
+        self.unit = unit
+        self._scale = 1 / unit
+        self._bits = math.ceil(math.log2(2 * 10**digits))  # SUB-BUCKETS PER POWER OF TWO
+        self._half = 1 << (self._bits - 1)
+        self._limit = int(math.ceil(highest * self._scale))
+        self.counts = array("q", bytes(8 * (self._index(self._limit) + 1)))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _index(self, value):
+        """
+        RETURN COUNTER INDEX FOR value (IN unit STEPS)
+        """
+        shift = value.bit_length() - self._bits
+        if shift <= 0:
+            return value
+        return ((shift + 1) << (self._bits - 1)) + (value >> shift) - self._half
+
+    def _highest_equivalent(self, index):
+        """
+        RETURN LARGEST VALUE (IN unit STEPS) COUNTED AT index
+        """
+        sub_buckets = 1 << self._bits
+        if index < sub_buckets:
+            return index
+        shift, sub = divmod(index - sub_buckets, self._half)
+        shift += 1
+        return ((sub + self._half + 1) << shift) - 1
+
+    def _value(self, index):
+        """
+        RETURN LARGEST DURATION (IN SECONDS) COUNTED AT index
+        """
+        if index == len(self.counts) - 1:
+            return self.max  # THE LAST COUNTER ALSO HOLDS EVERYTHING OVER highest
+        return min(self._highest_equivalent(index) * self.unit, self.max)
+
+    def record(self, seconds):
+        """
+        COUNT ONE DURATION, IN SECONDS
+        """
+        value = int(seconds * self._scale)
+        if value < 0:
+            value = 0
+        elif value > self._limit:
+            value = self._limit
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent):
+        """
+        RETURN DURATION (IN SECONDS) THAT percent OF THE RECORDED DURATIONS ARE AT, OR BELOW
+        """
+        if not self.count:
+            return None
+        target = max(1, math.ceil(percent / 100 * self.count))
+        running = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            running += count
+            if running >= target:
+                return self._value(index)
+        return self.max
+
+    def summary(self, percentiles=PERCENTILES):
+        """
+        RETURN Data(count, total, mean, max, p50, p90, p99, p999), IN SECONDS
+        """
+        output = Data(count=self.count, total=self.total, max=self.max)
+        if self.count:
+            output.mean = self.total / self.count
+        # ONE PASS OVER THE COUNTERS FOR ALL PERCENTILES
+        targets = sorted((max(1, math.ceil(p / 100 * self.count)), p) for p in percentiles)
+        running, t = 0, 0
+        for index, count in enumerate(self.counts):
+            if t == len(targets):
+                break
+            if not count:
+                continue
+            running += count
+            while t < len(targets) and running >= targets[t][0]:
+                output[_name(targets[t][1])] = self._value(index)
+                t += 1
+        return output
+
+    def cumulative(self, bounds):
+        """
+        RETURN, FOR EACH OF bounds (IN SECONDS, ASCENDING), THE NUMBER OF DURATIONS AT OR BELOW IT
+        (TO WITHIN THE HISTOGRAM'S PRECISION; THE COUNTER HOLDING A BOUND IS INCLUDED)
+        """
+        counts = self.counts
+        output = []
+        running, index = 0, 0
+        for bound in bounds:
+            value = int(bound * self._scale)
+            if value >= self._limit:
+                last = len(counts)
+            else:
+                last = self._index(max(value, 0)) + 1
+            while index < last:
+                running += counts[index]
+                index += 1
+            output.append(running)
+        return output
+
+    def merge(self, other):
+        """
+        ADD THE COUNTS OF other (WITH THE SAME highest, digits AND unit) TO self
+        """
+        if (other.highest, other.digits, other.unit) != (self.highest, self.digits, self.unit):
+            logger.error("Can only merge histograms with the same highest, digits and unit")
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.max > self.max:
+            self.max = other.max
+        return self
+
+    def copy(self):
+        output = LatencyHistogram(self.highest, self.digits, self.unit)
+        return output.merge(self)
+
+    def serialize(self):
+        """
+        RETURN JSON-ABLE dict, WITH ONLY THE NON-ZERO COUNTERS
+        """
+        return {
+            "highest": self.highest,
+            "digits": self.digits,
+            "unit": self.unit,
+            "total": self.total,
+            "max": self.max,
+            "counts": [[i, c] for i, c in enumerate(self.counts) if c],
+        }
+
+    @staticmethod
+    def deserialize(data):
+        output = LatencyHistogram(data["highest"], data["digits"], data["unit"])
+        for index, count in data["counts"]:
+            output.counts[index] = count
+            output.count += count
+        output.total = data["total"]
+        output.max = data["max"]
+        return output
+
+    def __len__(self):
+        return self.count
+
+
+def _name(percent):
+    # 99.9 -> p999
+    return "p" + f"{percent:g}".replace(".", "")
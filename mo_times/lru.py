@@ -0,0 +1,85 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from collections import OrderedDict
+
+from mo_future import allocate_lock
+
+
+class LRU:
+    """
+    SIZE-BOUNDED, THREAD-SAFE, LEAST-RECENTLY-USED CACHE
+    KEYS ARE SPREAD OVER SHARDS, EACH WITH ITS OWN LOCK, SO THERE IS NO GLOBAL LOCK
+    """
+
+    __slots__ = ["capacity", "_shards", "_mask"]
+
+    def __init__(self, capacity=10_000, shards=16):
+        num_shards = 1
+        while num_shards < shards:
+            num_shards *= 2
+        self.capacity = capacity
+        self._mask = num_shards - 1
+        self._shards = tuple(_Shard(max(1, -(-capacity // num_shards))) for _ in range(num_shards))
+
+    def get(self, key, default=None):
+        return self._shards[hash(key) & self._mask].get(key, default)
+
+    def set(self, key, value):
+        self._shards[hash(key) & self._mask].set(key, value)
+
+    def clear(self):
+        for s in self._shards:
+            s.clear()
+
+    @property
+    def hits(self):
+        return sum(s.hits for s in self._shards)
+
+    @property
+    def misses(self):
+        return sum(s.misses for s in self._shards)
+
+    def __len__(self):
+        return sum(len(s.items) for s in self._shards)
+
+
+class _Shard:
+    __slots__ = ["lock", "items", "capacity", "hits", "misses"]
+
+    def __init__(self, capacity):
+        self.lock = allocate_lock()
+        self.items = OrderedDict()
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default):
+        with self.lock:
+            items = self.items
+            if key in items:
+                items.move_to_end(key)
+                self.hits += 1
+                return items[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self.lock:
+            items = self.items
+            items[key] = value
+            items.move_to_end(key)
+            if len(items) > self.capacity:
+                items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+            self.hits = 0
+            self.misses = 0
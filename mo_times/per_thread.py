@@ -0,0 +1,103 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# ONE ACCUMULATOR PER THREAD, SO THE RECORD PATH TAKES NO LOCK
+#
+# THE ACCUMULATORS OF THREADS THAT HAVE EXITED ARE FOLDED INTO ONE retired
+# ACCUMULATOR (WHEN ANOTHER THREAD STARTS RECORDING, OR ON collect()), SO
+# MEMORY IS BOUNDED BY THE NUMBER OF LIVE THREADS
+#
+import threading
+from weakref import ref
+
+from mo_future import allocate_lock
+
+
+class _Slot:
+    __slots__ = ["generation", "thread", "value"]
+
+    def __init__(self, generation, thread, value):
+        self.generation = generation
+        self.thread = ref(thread)
+        self.value = value
+
+    def alive(self):
+        thread = self.thread()
+        return thread is not None and thread.is_alive()
+
+
+class PerThread:
+    """
+    new() - RETURN AN EMPTY ACCUMULATOR
+    merge(into, other) - ADD ACCUMULATOR other TO into
+    """
+
+    def __init__(self, new, merge):
+        self.new = new
+        self.merge = merge
+        self.lock = allocate_lock()
+        self.local = threading.local()
+        self.slots = []  # ACCUMULATORS OF LIVE THREADS
+        self.retired = new()  # EVERYTHING RECORDED BY THREADS THAT HAVE EXITED
+        self.generation = 0  # reset MOVES TO A NEW GENERATION; OLD ACCUMULATORS ARE IGNORED
+
+    def get(self):
+        """
+        RETURN THE ACCUMULATOR OF THE CURRENT THREAD
+        """
+        slot = getattr(self.local, "slot", None)
+        if slot is None or slot.generation != self.generation:
+            slot = self._new_slot()
+        return slot.value
+
+    def _new_slot(self):
+        with self.lock:
+            self._retire()
+            slot = _Slot(self.generation, threading.current_thread(), self.new())
+            self.slots.append(slot)
+            self.local.slot = slot
+            return slot
+
+    def _retire(self):
+        # CALLED WITH self.lock HELD
+        alive = []
+        for slot in self.slots:
+            if slot.alive():
+                alive.append(slot)
+            else:
+                self.merge(self.retired, slot.value)
+        self.slots = alive
+
+    def collect(self, reset=False):
+        """
+        RETURN LIST OF ACCUMULATORS TO MERGE (A COPY OF THE retired ONE, THEN ONE PER LIVE THREAD)
+        """
+        with self.lock:
+            self._retire()
+            retired = self.merge(self.new(), self.retired)
+            values = [retired] + [s.value for s in self.slots]
+            if reset:
+                self.generation += 1
+                self.slots = []
+                self.retired = self.new()
+        return values
+
+    def __len__(self):
+        return len(self.slots)
+
+
+def copy_items(values):
+    """
+    RETURN LIST OF values.items(), WHILE ANOTHER THREAD MAY BE ADDING TO values
+    """
+    while True:
+        try:
+            return list(values.items())
+        except RuntimeError:
+            continue
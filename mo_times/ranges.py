@@ -0,0 +1,149 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import math
+
+from mo_imports import delay_import
+
+from mo_times.civil import add_months, civil_from_days, split_unix
+from mo_times.dates import Date, _unix, _unix2Date
+from mo_times.durations import Duration
+
+logger = delay_import("mo_logs.logger")
+
+
+class DateRange:
+    """
+    LIKE range(), BUT FOR TIME: THE Dates FROM min (INCLUSIVE) TO max (EXCLUSIVE), interval APART
+    ELEMENT i IS min + i*interval, COMPUTED WHEN ASKED (CALENDAR ARITHMETIC FOR MONTH INTERVALS)
+    """
+
+    __slots__ = ["origin", "step", "indexes"]
+
+    def __init__(self, min, max, interval):
+        if not isinstance(interval, Duration):
+            interval = Duration(interval)
+        if interval.month < 0 or (not interval.month and interval.milli <= 0):
+            logger.error("Expecting a positive interval, not {interval}", interval=str(interval))
+        origin, max = Date(min), Date(max)
+        if origin == None:
+            logger.error("Expecting a min date, not {min}", min=min)
+        self.origin = origin
+        self.step = interval
+        # LIKE THE OLD GENERATOR, NO max MEANS NO ELEMENTS
+        self.indexes = range(0) if max == None else range(self._count(max.unix))
+
+    def _count(self, max_unix):
+        """
+        RETURN NUMBER OF ELEMENTS BEFORE max_unix
+        """
+        if max_unix <= self.origin.unix:
+            return 0
+        index = self._index(max_unix)
+        if self._unix(index) < max_unix:
+            index += 1
+        return index
+
+    def _unix(self, index):
+        """
+        RETURN unix OF ELEMENT index (COUNTING FROM origin, IGNORING SLICING)
+        """
+        if self.step.month:
+            seconds, micro = split_unix(self.origin.unix)
+            return add_months(seconds, micro, index * self.step.month)
+        return self.origin.unix + index * self.step.seconds
+
+    def _index(self, unix):
+        """
+        RETURN index OF ELEMENT AT, OR BEFORE, unix (COUNTING FROM origin, IGNORING SLICING)
+        """
+        step = self.step
+        if step.month:
+            origin_year, origin_month, _ = civil_from_days(split_unix(self.origin.unix)[0] // 86400)
+            year, month, _ = civil_from_days(split_unix(unix)[0] // 86400)
+            index = ((year - origin_year) * 12 + month - origin_month) // step.month
+        else:
+            index = math.floor((unix - self.origin.unix) / step.seconds)
+        # ESTIMATE MAY BE OFF BY ONE (FLOAT ROUNDING, END-OF-MONTH CLAMPING)
+        while self._unix(index) > unix:
+            index -= 1
+        while self._unix(index + 1) <= unix:
+            index += 1
+        return index
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __bool__(self):
+        return bool(self.indexes)
+
+    def __iter__(self):
+        for i in self.indexes:
+            yield _unix2Date(self._unix(i))
+
+    def __reversed__(self):
+        return self[::-1]
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            output = object.__new__(DateRange)
+            output.origin = self.origin
+            output.step = self.step
+            output.indexes = self.indexes[item]
+            return output
+        return _unix2Date(self._unix(self.indexes[item]))
+
+    def __contains__(self, value):
+        unix = _unix(value)
+        if unix is None:
+            return False
+        index = self._index(unix)
+        return index in self.indexes and self._unix(index) == unix
+
+    def index_of(self, value):
+        """
+        RETURN POSITION OF THE ELEMENT WHOSE INTERVAL [element, element + interval) HOLDS value
+        RETURN None IF value IS NOT COVERED BY THIS RANGE
+        """
+        unix = _unix(value)
+        if unix is None:
+            return None
+        index = self._index(unix)
+        if index not in self.indexes:
+            return None
+        return self.indexes.index(index)
+
+    def _key(self):
+        """
+        RETURN TUPLE THAT IS THE SAME FOR RANGES WITH THE SAME ELEMENTS (LIKE range() COMPARES)
+        """
+        indexes = self.indexes
+        size = len(indexes)
+        if not size:
+            return (0,)
+        first = self._unix(indexes[0])
+        if size == 1:
+            return (1, first)
+        if self.step.month:
+            # END-OF-MONTH CLAMPING DEPENDS ON THE DAY OF THE origin
+            day = civil_from_days(split_unix(self.origin.unix)[0] // 86400)[2]
+            return (size, first, self.step.month * indexes.step, day)
+        return (size, first, self.step.milli * indexes.step)
+
+    def __eq__(self, other):
+        if isinstance(other, DateRange):
+            return self._key() == other._key()
+        return False
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"DateRange({self.origin}, {self.step}, {self.indexes})"
+
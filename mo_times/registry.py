@@ -0,0 +1,184 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# PROCESS-WIDE STATISTICS FOR NAMED Timers
+#
+# EACH THREAD RECORDS INTO ITS OWN ACCUMULATORS (SEE per_thread.py), SO THE
+# RECORD PATH TAKES NO LOCK; snapshot() MERGES THE ACCUMULATORS OF ALL THREADS
+#
+import threading
+
+from mo_dots import Data
+from mo_future import allocate_lock
+from mo_imports import delay_import
+
+from mo_times.durations import Duration, MINUTE
+from mo_times.latency import LatencyHistogram
+from mo_times.per_thread import PerThread, copy_items
+
+logger = delay_import("mo_logs.logger")
+
+
+class Stats:
+    """
+    COUNT, TOTAL, MIN AND MAX OF SECONDS, WITH A LatencyHistogram FOR PERCENTILES
+    """
+
+    __slots__ = ["count", "total", "min", "max", "histogram"]
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.histogram = LatencyHistogram()
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.histogram.record(seconds)
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.histogram.merge(other.histogram)
+        return self
+
+
+class TimerRegistry:
+    """
+    NAMED Timer STATISTICS, MERGED ACROSS THREADS
+    """
+
+    def __init__(self):
+        self.lock = allocate_lock()
+        self.threads = PerThread(dict, _merge_stats)  # MAP FROM name TO Stats, FOR EACH THREAD
+        self.summary = None  # THREAD LOGGING PERIODIC SUMMARIES
+        self.please_stop = None
+        self.listeners = ()  # ALSO CALLED WITH (name, seconds) FOR EVERY MEASUREMENT
+
+    def record(self, name, seconds):
+        """
+        ADD ONE MEASUREMENT (IN SECONDS) FOR name
+        """
+        acc = self.threads.get()
+        stats = acc.get(name)
+        if stats is None:
+            stats = acc[name] = Stats()
+        stats.add(seconds)
+        for listener in self.listeners:
+            listener(name, seconds)
+
+    def add_listener(self, listener):
+        """
+        CALL listener(name, seconds) FOR EVERY MEASUREMENT; IT MUST BE QUICK, AND NOT RAISE
+        """
+        with self.lock:
+            self.listeners = self.listeners + (listener,)
+
+    def remove_listener(self, listener):
+        with self.lock:
+            self.listeners = tuple(l for l in self.listeners if l is not listener)
+
+    def snapshot(self, reset=False):
+        """
+        RETURN dict MAPPING EACH NAME TO Data(count, total, min, max, mean, p50, p90, p99, p999), IN SECONDS
+        """
+        return {name: summarize(all_stats) for name, all_stats in self._merge(reset)}
+
+    def histograms(self, reset=False):
+        """
+        RETURN dict MAPPING EACH NAME TO ITS LatencyHistogram, MERGED ACROSS THREADS
+        """
+        return {name: merge_histograms(all_stats) for name, all_stats in self._merge(reset)}
+
+    def _merge(self, reset):
+        """
+        RETURN (name, list of Stats) PAIRS, ONE Stats PER LIVE THREAD (AND ONE FOR EXITED THREADS), IN ORDER OF name
+        """
+        merged = {}
+        for acc in self.threads.collect(reset):
+            for name, stats in copy_items(acc):
+                merged.setdefault(name, []).append(stats)
+
+        return sorted(merged.items())
+
+    def reset(self):
+        """
+        FORGET ALL MEASUREMENTS
+        """
+        self.snapshot(reset=True)
+
+    def start_summary(self, interval=MINUTE, reset=True):
+        """
+        LOG A SUMMARY OF ALL TIMERS EVERY interval
+        """
+        seconds = Duration(interval).seconds
+
+        def worker(please_stop):
+            while not please_stop.wait(seconds):
+                self.log_summary(reset=reset)
+
+        with self.lock:
+            if self.summary:
+                return
+            self.please_stop = threading.Event()
+            self.summary = threading.Thread(target=worker, args=(self.please_stop,), name="timer summary", daemon=True)
+            self.summary.start()
+
+    def stop_summary(self):
+        with self.lock:
+            summary, self.summary = self.summary, None
+            if not summary:
+                return
+            self.please_stop.set()
+        summary.join()
+
+    def log_summary(self, reset=False):
+        snapshot = self.snapshot(reset=reset)
+        if snapshot:
+            logger.info("Timer summary {{summary|json}}", summary=snapshot)
+
+
+def summarize(all_stats):
+    """
+    MERGE THE Stats OF MANY THREADS
+    """
+    count = sum(s.count for s in all_stats)
+    if not count:
+        return Data(count=0, total=0.0)
+    output = merge_histograms(all_stats).summary()
+    output.min = min(s.min for s in all_stats)
+    output.max = max(s.max for s in all_stats)
+    return output
+
+
+def merge_histograms(all_stats):
+    histogram = all_stats[0].histogram.copy()
+    for s in all_stats[1:]:
+        histogram.merge(s.histogram)
+    return histogram
+
+
+def _merge_stats(into, other):
+    for name, stats in copy_items(other):
+        existing = into.get(name)
+        if existing is None:
+            existing = into[name] = Stats()
+        existing.merge(stats)
+    return into
+
+
+REGISTRY = TimerRegistry()
@@ -0,0 +1,160 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# SAMPLE THE STACK OF A THREAD THAT IS TAKING TOO LONG
+#
+# ONE WATCHER THREAD KEEPS A HEAP OF DEADLINES; NOTHING IS SAMPLED UNTIL A
+# DEADLINE PASSES, SO A BLOCK THAT FINISHES IN TIME ONLY PAYS FOR AN APPEND
+#
+import os
+import sys
+import threading
+from collections import deque
+from heapq import heappop, heappush
+from itertools import count
+from time import perf_counter_ns
+
+from mo_future import allocate_lock
+
+DEFAULT_INTERVAL = 0.01  # SECONDS BETWEEN SAMPLES
+
+
+class Watch:
+    """
+    THE SAMPLES OF ONE THREAD, TAKEN AFTER ITS DEADLINE PASSED
+    """
+
+    __slots__ = ["lock", "ident", "created", "deadline", "interval", "done", "queued", "samples"]
+
+    def __init__(self, lock, ident, created, seconds, interval):
+        self.lock = lock
+        self.ident = ident
+        self.created = created
+        self.deadline = created + int(seconds * 1e9)
+        self.interval = int(interval * 1e9)
+        self.done = False
+        self.queued = False  # SET BY THE WORKER BEFORE IT CAN SAMPLE
+        self.samples = {}  # MAP FROM COLLAPSED STACK TO NUMBER OF TIMES SEEN
+
+    def stop(self):
+        """
+        STOP SAMPLING; RETURN THE COLLAPSED-STACK PROFILE (None IF NO SAMPLES WERE TAKEN)
+        """
+        self.done = True
+        if not self.queued:
+            return None  # NEVER REACHED THE HEAP, SO NEVER SAMPLED
+        # THE WORKER SAMPLES WHILE HOLDING THE LOCK, SO A SAMPLE BEING TAKEN NOW IS NOT LOST
+        with self.lock:
+            return collapse(self.samples)
+
+
+class Sampler:
+    """
+    WATCH THREADS, AND SAMPLE THE STACK OF ANY STILL BUSY PAST ITS DEADLINE
+
+    watch() ONLY APPENDS TO A deque (NO LOCK); THE WORKER MOVES WATCHES INTO ITS
+    HEAP ONCE THEY ARE tick OLD, SO BLOCKS THAT FINISH WITHIN tick NEVER REACH THE
+    HEAP, AND SAMPLING MAY START UP TO tick LATE
+    """
+
+    def __init__(self, tick=DEFAULT_INTERVAL):
+        self.tick = tick
+        self.lock = allocate_lock()
+        self.ready = threading.Condition(self.lock)
+        self.pending = deque()  # NEW WATCHES, NOT YET SEEN BY THE WORKER
+        self.todo = []  # HEAP OF (deadline_ns, order, Watch)
+        self.order = count()
+        self.idle = False  # WORKER IS WAITING FOR ANY WATCH
+        self.thread = None
+
+    def watch(self, seconds, interval=DEFAULT_INTERVAL, ident=None):
+        """
+        START SAMPLING THE THREAD (DEFAULT CURRENT) ONCE seconds HAVE PASSED, EVERY interval SECONDS
+        RETURN Watch; CALL stop() WHEN DONE
+        """
+        watch = Watch(
+            self.lock,
+            threading.get_ident() if ident is None else ident,
+            perf_counter_ns(),
+            seconds,
+            interval,
+        )
+        self.pending.append(watch)
+        if self.idle or self.thread is None:
+            self._wake()
+        return watch
+
+    def _wake(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._worker, name="timer sampler", daemon=True)
+                self.thread.start()
+            self.idle = False
+            self.ready.notify()
+
+    def _worker(self):
+        pending, todo, tick = self.pending, self.todo, self.tick
+        tick_ns = int(tick * 1e9)
+        with self.lock:
+            while True:
+                now = perf_counter_ns()
+                # WATCHES YOUNGER THAN tick STAY IN pending; MOST WILL BE done BEFORE THEY ARE LOOKED AT AGAIN
+                while pending and (pending[0].done or now - pending[0].created >= tick_ns):
+                    watch = pending.popleft()
+                    if not watch.done:
+                        watch.queued = True
+                        heappush(todo, (watch.deadline, next(self.order), watch))
+                while todo and todo[0][2].done:
+                    heappop(todo)
+                if not todo:
+                    self.idle = True
+                    if not pending:
+                        self.ready.wait()
+                    self.idle = False
+                    if pending and not pending[0].done:
+                        age = perf_counter_ns() - pending[0].created
+                        if age < tick_ns:
+                            self.ready.wait((tick_ns - age) / 1e9)
+                    continue
+                wait = todo[0][0] - perf_counter_ns()
+                if wait > 0:
+                    self.ready.wait(min(wait / 1e9, tick))
+                    continue
+                _, _, watch = heappop(todo)
+                _sample(watch)
+                if not watch.done:
+                    heappush(todo, (perf_counter_ns() + watch.interval, next(self.order), watch))
+
+
+def _sample(watch):
+    frame = sys._current_frames().get(watch.ident)
+    if frame is None or watch.done:
+        return
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    stack.reverse()
+    key = ";".join(stack)
+    samples = watch.samples
+    samples[key] = samples.get(key, 0) + 1
+
+
+def collapse(samples):
+    """
+    RETURN samples IN COLLAPSED-STACK FORMAT (ONE "root;...;leaf count" LINE PER STACK, MOST SEEN FIRST)
+    THE FORMAT flamegraph.pl AND speedscope READ
+    """
+    if not samples:
+        return None
+    return "\n".join(f"{stack} {n}" for stack, n in sorted(samples.items(), key=lambda p: -p[1]))
+
+
+SAMPLER = Sampler()
@@ -0,0 +1,140 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from array import array
+from bisect import bisect_left, bisect_right
+
+from mo_imports import delay_import
+
+from mo_times.dates import _unix, _unix2Date
+from mo_times.durations import Duration
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = delay_import("mo_logs.logger")
+
+
+class TimeIndex:
+    """
+    SORTED TIMESTAMPS, STORED AS ONE array("d") OF unix SECONDS
+    LOOKUPS RETURN POSITIONS, SO VALUES CAN BE KEPT IN ANY PARALLEL SEQUENCE
+    """
+
+    __slots__ = ["unix"]
+
+    def __init__(self, dates=None):
+        unix = array("d", (_required(d) for d in dates or []))
+        for a, b in zip(unix, unix[1:]):
+            if b < a:
+                logger.error("Expecting dates in order, not {a} then {b}", a=_unix2Date(a), b=_unix2Date(b))
+        self.unix = unix
+
+    @staticmethod
+    def from_unix(unix):
+        """
+        RETURN TimeIndex OF THE GIVEN (SORTED) unix TIMESTAMPS, WITHOUT CHECKING
+        """
+        output = object.__new__(TimeIndex)
+        output.unix = unix if isinstance(unix, array) and unix.typecode == "d" else array("d", unix)
+        return output
+
+    def __len__(self):
+        return len(self.unix)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return TimeIndex.from_unix(self.unix[item])
+        return _unix2Date(self.unix[item])
+
+    def __iter__(self):
+        for u in self.unix:
+            yield _unix2Date(u)
+
+    def asof(self, date):
+        """
+        RETURN POSITION OF THE LAST TIMESTAMP AT, OR BEFORE, date (None IF THERE IS NONE)
+        """
+        index = bisect_right(self.unix, _required(date)) - 1
+        return None if index < 0 else index
+
+    def range(self, min, max):
+        """
+        RETURN range() OF POSITIONS WITH min <= timestamp < max
+        """
+        unix = self.unix
+        return range(bisect_left(unix, _required(min)), bisect_left(unix, _required(max)))
+
+    def nearest(self, date, tolerance=None):
+        """
+        RETURN POSITION OF THE TIMESTAMP CLOSEST TO date (THE EARLIEST POSITION WINS TIES)
+        RETURN None IF THERE IS NONE WITHIN tolerance
+        """
+        unix = self.unix
+        target = _required(date)
+        index = bisect_left(unix, target)
+        best = None
+        if index < len(unix):
+            best = index
+        if index > 0 and (best is None or target - unix[index - 1] <= unix[best] - target):
+            best = bisect_left(unix, unix[index - 1], 0, index)  # FIRST OF ANY DUPLICATES
+        if best is None:
+            return None
+        if tolerance is not None and abs(unix[best] - target) > _seconds(tolerance):
+            return None
+        return best
+
+    def asof_join(self, other, tolerance=None):
+        """
+        FOR EACH TIMESTAMP IN self, THE POSITION OF THE LAST TIMESTAMP IN other AT, OR BEFORE, IT
+        RETURN array("q") OF POSITIONS, -1 WHERE THERE IS NO MATCH (OR IT IS OLDER THAN tolerance)
+        BOTH ARE SORTED, SO EACH SEARCH STARTS WHERE THE LAST ONE ENDED
+        """
+        left, right = self.unix, other.unix
+        limit = None if tolerance is None else _seconds(tolerance)
+        if np is not None:
+            return _asof_join_numpy(left, right, limit)
+
+        output = array("q", bytes(8 * len(left)))
+        j = 0  # NEXT CANDIDATE IN other; NEVER MOVES BACKWARD
+        for i, t in enumerate(left):
+            j = bisect_right(right, t, j)
+            if j == 0 or (limit is not None and t - right[j - 1] > limit):
+                output[i] = -1
+            else:
+                output[i] = j - 1
+        return output
+
+
+def _required(date):
+    # A MISSING DATE HAS NO POSITION
+    unix = _unix(date)
+    if unix is None:
+        logger.error("Expecting a date, not {date}", date=date)
+    return unix
+
+
+def _seconds(duration):
+    return duration.seconds if isinstance(duration, Duration) else Duration(duration).seconds
+
+
+def _asof_join_numpy(left, right, limit):
+    """
+    SAME AS asof_join(), ALL AT ONCE (NO COPY OF THE ARRAYS)
+    """
+    left = np.frombuffer(left, dtype=np.float64)
+    right = np.frombuffer(right, dtype=np.float64)
+    found = np.searchsorted(right, left, side="right") - 1
+    if limit is not None and len(right):
+        found[(found >= 0) & (left - right[np.maximum(found, 0)] > limit)] = -1
+    output = array("q")
+    output.frombytes(found.astype(np.int64).tobytes())
+    return output
@@ -0,0 +1,198 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# NESTED Timers AS PARENT/CHILD SPANS
+#
+# THE RUNNING SPAN IS KEPT IN A ContextVar, SO EACH THREAD, AND EACH asyncio
+# TASK, HAS ITS OWN STACK. EACH THREAD ADDS TO ITS OWN TREE OF SpanNodes (NO
+# LOCK, SEE per_thread.py); tree() MERGES THEM. THE LAST trace_size SPANS ARE ALSO KEPT, FOR
+# chrome_trace()
+#
+import os
+import threading
+from collections import deque
+from contextvars import ContextVar
+
+from mo_times.per_thread import PerThread, copy_items
+
+TRACE_SIZE = 10_000
+
+
+class SpanNode:
+    """
+    ALL RUNS OF ONE SPAN, UNDER ONE PATH OF PARENTS
+    TIMES ARE IN NANOSECONDS; self_time EXCLUDES THE TIME WHEN ANY CHILD SPAN WAS RUNNING
+    (CONCURRENT CHILDREN, LIKE asyncio.gather() TASKS, COUNT ONCE)
+    """
+
+    __slots__ = ["name", "parent", "root", "children", "count", "total_time", "self_time"]
+
+    def __init__(self, name=None, parent=None):
+        self.name = name
+        self.parent = parent
+        self.root = self if parent is None else parent.root
+        self.children = {}
+        self.count = 0
+        self.total_time = 0
+        self.self_time = 0
+
+    def child(self, name):
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = SpanNode(name, self)
+        return node
+
+    def merge(self, other):
+        """
+        ADD THE COUNTS AND TIMES OF other (AND ITS CHILDREN) TO self
+        """
+        self.count += other.count
+        self.total_time += other.total_time
+        self.self_time += other.self_time
+        for name, child in copy_items(other.children):
+            self.child(name).merge(child)
+        return self
+
+    def collapsed(self):
+        """
+        RETURN COLLAPSED-STACK TEXT ("root;...;leaf self_microseconds" PER LINE), FOR FLAME GRAPHS
+        """
+        lines = []
+
+        def walk(node, path):
+            for name, child in sorted(node.children.items()):
+                stack = path + (name,)
+                if child.self_time >= 1000:
+                    lines.append(";".join(stack) + f" {child.self_time // 1000}")
+                walk(child, stack)
+
+        walk(self, ())
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"SpanNode({self.name!r}, count={self.count}, total_time={self.total_time}, self_time={self.self_time})"
+
+
+class _Running:
+    """
+    ONE SPAN, WHILE IT RUNS
+    """
+
+    __slots__ = ["node", "parent", "start", "child_time", "children", "busy_since", "token"]
+
+    def __init__(self, node, parent, start):
+        self.node = node
+        self.parent = parent
+        self.start = start
+        self.child_time = 0  # WALL TIME WHEN AT LEAST ONE CHILD WAS RUNNING
+        self.children = 0  # NUMBER OF CHILDREN RUNNING NOW
+        self.busy_since = 0  # WHEN children WENT FROM 0 TO 1
+        self.token = None
+
+
+class SpanRecorder:
+    """
+    AGGREGATE NESTED SPANS INTO A TREE, AND KEEP THE LAST trace_size FOR TRACING
+    """
+
+    def __init__(self, trace_size=TRACE_SIZE):
+        self.threads = PerThread(SpanNode, SpanNode.merge)  # ROOT SpanNode OF EACH THREAD
+        self.current = ContextVar("span", default=None)
+        self.trace = deque(maxlen=trace_size)  # (name, thread, start, duration), IN NANOSECONDS
+
+    def enter(self, name, start):
+        """
+        START A SPAN (AT perf_counter_ns() start) UNDER THE CURRENT ONE; RETURN IT, FOR exit()
+        """
+        root = self.threads.get()
+        parent = self.current.get()
+        if parent is None:
+            node = root.child(name)
+        elif parent.node.root is root:
+            node = parent.node.child(name)
+        else:
+            # PARENT RAN IN ANOTHER THREAD (OR BEFORE A reset()); FIND THE SAME PATH IN OUR TREE
+            node = root
+            for n in _path(parent.node):
+                node = node.child(n)
+            node = node.child(name)
+        if parent is not None:
+            if not parent.children:
+                parent.busy_since = start
+            parent.children += 1
+        span = _Running(node, parent, start)
+        span.token = self.current.set(span)
+        return span
+
+    def exit(self, span, end):
+        """
+        END span (AT perf_counter_ns() end)
+        """
+        duration = end - span.start
+        node = span.node
+        node.count += 1
+        node.total_time += duration
+        node.self_time += duration - span.child_time
+        parent = span.parent
+        if parent is not None:
+            parent.children -= 1
+            if not parent.children:
+                parent.child_time += end - parent.busy_since
+        try:
+            self.current.reset(span.token)
+        except ValueError:
+            # ENDED IN ANOTHER CONTEXT THAN IT STARTED
+            self.current.set(parent)
+        self.trace.append((node.name, threading.get_ident(), span.start, duration))
+
+    def tree(self, reset=False):
+        """
+        RETURN ROOT SpanNode, MERGED ACROSS THREADS
+        """
+        roots = self.threads.collect(reset)
+        if reset:
+            self.trace.clear()
+        output = SpanNode(None)
+        for root in roots:
+            output.merge(root)
+        return output
+
+    def reset(self):
+        self.tree(reset=True)
+
+    def collapsed(self, reset=False):
+        """
+        RETURN THE TREE AS COLLAPSED-STACK TEXT, FOR flamegraph.pl OR speedscope
+        """
+        return self.tree(reset).collapsed()
+
+    def chrome_trace(self):
+        """
+        RETURN THE RECENT SPANS AS CHROME TRACE-EVENT JSON (json.dumps() IT, THEN OPEN IN chrome://tracing OR PERFETTO)
+        """
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {"name": name, "ph": "X", "ts": start / 1000, "dur": duration / 1000, "pid": pid, "tid": thread}
+                for name, thread, start, duration in list(self.trace)
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+
+def _path(node):
+    path = []
+    while node.parent is not None:
+        path.append(node.name)
+        node = node.parent
+    path.reverse()
+    return path
+
+
+SPANS = SpanRecorder()
@@ -6,17 +6,24 @@
 #
 # Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
 #
+import inspect
 from datetime import timedelta
-from time import time
+from functools import wraps
+from time import perf_counter_ns, time, time_ns
 
-from mo_dots import coalesce, to_data
+from mo_dots import Data, coalesce, to_data
 from mo_imports import delay_import
 
 from mo_times.durations import Duration
+from mo_times.registry import REGISTRY
+from mo_times.sampler import DEFAULT_INTERVAL, SAMPLER
+from mo_times.spans import SPANS
 
 logger = delay_import("mo_logs.logger")
 
 START = time()
+# ONE time_ns()/perf_counter_ns() PAIR, TO TURN perf_counter_ns() INTO WALL-CLOCK unix NANOSECONDS
+_WALL_OFFSET = time_ns() - perf_counter_ns()
 
 
 class Timer:
@@ -26,8 +33,28 @@ class Timer:
         something_that_takes_long()
     OUTPUT:
         doing hard time took 45.468 sec
+
+    TIMES ARE FROM THE MONOTONIC perf_counter_ns(); THE param Data, AND ITS duration,
+    ARE ONLY MADE WHEN ASKED FOR. THE RARELY USED OPTIONS (record, busy, histogram,
+    sample, span) ARE KEPT IN ONE _Options, WHICH IS None FOR A PLAIN Timer
     """
 
+    __slots__ = [
+        "template",
+        "_param",
+        "verbose",
+        "agg",
+        "too_long",
+        "_start",
+        "_end",
+        "interval",
+        "options",
+        "busy",
+        "profile",
+        "_watch",
+        "_span",
+    ]
+
     def __init__(
         self,
         description,  # A DESCRIPTION
@@ -35,56 +62,226 @@ class Timer:
         silent=None,  # DO NOT LOG
         verbose=None,  # PLEASE LOG
         too_long=0,  # ONLY LOG IF MORE THAN THIS NUMBER OF SECONDS
+        record=None,  # ADD EACH INTERVAL TO THE REGISTRY, UNDER THIS NAME (True FOR description)
+        busy=False,  # FOR DECORATED COROUTINES, ALSO MEASURE THE TIME SPENT HOLDING THE EVENT LOOP
+        histogram=None,  # LatencyHistogram TO RECORD EACH INTERVAL INTO
+        sample=None,  # ONCE PAST too_long, SAMPLE THE THREAD'S STACK EVERY sample SECONDS (True FOR 0.01)
+        span=None,  # RECORD AS A SPAN, NESTED UNDER ANY RUNNING SPAN (True FOR spans.SPANS, OR A SpanRecorder)
     ):
         self.template = description
-        self.param = to_data(coalesce(param, {}))
-        self.verbose = coalesce(verbose, False if silent is True else too_long == 0)
+        self._param = param
+        # verbose MAY BE Null (A MISSING SETTING), WHICH FALLS BACK TO THE DEFAULT, LIKE coalesce()
+        self.verbose = silent is not True and too_long == 0 if verbose is None or verbose == None else verbose
         self.agg = 0
         self.too_long = too_long  # ONLY SHOW TIMING FOR DURATIONS THAT ARE too_long
-        self.start = 0
-        self.end = 0
+        self._start = 0
+        self._end = 0
         self.interval = None
+        self.busy = None  # SECONDS THE COROUTINE HELD THE EVENT LOOP (WHEN busy)
+        self.profile = None  # COLLAPSED STACKS SAMPLED WHILE TOO LONG (WHEN sample)
+        if record is None and busy is False and histogram is None and sample is None and span is None:
+            self.options = None
+        else:
+            self.options = _Options(description, record, busy, histogram, sample, span)
+
+    @property
+    def param(self):
+        param = self._param
+        if param.__class__ is not Data:
+            param = self._param = to_data(coalesce(param, {}))
+        if self.interval is not None:
+            param.duration = timedelta(seconds=self.interval)
+        if self.busy is not None:
+            param.busy = timedelta(seconds=self.busy)
+        return param
+
+    @property
+    def start(self):
+        """
+        WALL-CLOCK unix SECONDS (0 BEFORE THE Timer STARTS); THE INTERVAL IS STILL MEASURED ON THE MONOTONIC CLOCK
+        """
+        return (self._start + _WALL_OFFSET) / 1e9 if self._start else 0
+
+    @start.setter
+    def start(self, value):
+        self._start = int(value * 1e9) - _WALL_OFFSET if value else 0
+
+    @property
+    def end(self):
+        return (self._end + _WALL_OFFSET) / 1e9 if self._end else 0
+
+    @end.setter
+    def end(self, value):
+        self._end = int(value * 1e9) - _WALL_OFFSET if value else 0
 
     def __enter__(self):
         if self.verbose:
             logger.note(
                 "Timer start: " + self.template, default_params=self.param, stack_depth=1, static_template=False
             )
-        self.start = time()
+        start = self._start = perf_counter_ns()
+        if self.options is not None:
+            self.options.enter(self, start)
         return self
 
     def __exit__(self, type, value, traceback):
-        self.end = time()
-        self.interval = self.end - self.start
-        self.agg += self.interval
-        self.param.duration = timedelta(seconds=self.interval)
+        end = self._end = perf_counter_ns()
+        interval = self.interval = (end - self._start) / 1e9
+        self.agg += interval
+        if self.options is not None:
+            self.options.exit(self, end, interval)
         if self.verbose:
             if self.too_long == 0:
+                took = " (took {{duration}})" if self.busy is None else " (took {{duration}}, busy {{busy}})"
                 logger.note(
-                    "Timer end  : " + self.template + " (took {{duration}})",
+                    "Timer end  : " + self.template + took,
                     default_params=self.param,
                     stack_depth=1,
                     static_template=False,
                 )
-            elif self.interval >= self.too_long:
+            elif interval >= self.too_long:
+                param = self.param
+                profile = ""
+                if self.profile:
+                    param.profile = self.profile
+                    profile = "\n{{profile|indent}}"
                 logger.note(
-                    "Time too long: " + self.template + " ({{duration}})",
-                    default_params=self.param,
+                    "Time too long: " + self.template + " ({{duration}})" + profile,
+                    default_params=param,
                     stack_depth=1,
                     static_template=False,
                 )
 
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, type, value, traceback):
+        self.__exit__(type, value, traceback)
+
+    def __call__(self, func):
+        """
+        USE AS A DECORATOR, TO TIME EVERY CALL OF func (OR COROUTINE FUNCTION)
+        THE ARGUMENTS OF THE CALL ARE AVAILABLE TO THE DESCRIPTION TEMPLATE
+        """
+        signature = inspect.signature(func)
+
+        def new_timer(args, kwargs):
+            param = self._param
+            if self.verbose and "{" in self.template:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                param = {**bound.arguments, **(param or {})}
+            timer = Timer(self.template, param, verbose=self.verbose, too_long=self.too_long)
+            timer.options = self.options
+            return timer
+
+        def done(timer):
+            if timer.interval is not None:
+                self.agg += timer.interval
+                self.interval, self._start, self._end, self.busy = timer.interval, timer._start, timer._end, timer.busy
+                self.profile = timer.profile
+
+        measure_busy = self.options is not None and self.options.busy
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def timed(*args, **kwargs):
+                timer = new_timer(args, kwargs)
+                try:
+                    async with timer:
+                        if measure_busy:
+                            return await _Busy(func(*args, **kwargs), timer)
+                        return await func(*args, **kwargs)
+                finally:
+                    done(timer)
+
+        else:
+
+            @wraps(func)
+            def timed(*args, **kwargs):
+                timer = new_timer(args, kwargs)
+                try:
+                    with timer:
+                        return func(*args, **kwargs)
+                finally:
+                    done(timer)
+
+        timed.timer = self
+        return timed
+
     @property
     def duration(self):
-        end = time()
-        if not self.end:
-            return Duration(end - self.start)
+        if not self._end:
+            return Duration((perf_counter_ns() - self._start) / 1e9)
 
         return Duration(self.interval)
 
     @property
     def total(self):
-        if not self.end:
+        if not self._end:
             logger.error("please ask for total time outside the context of measuring")
 
         return Duration(self.agg)
+
+
+class _Options:
+    """
+    THE RARELY USED Timer OPTIONS, AND WHAT THEY DO ON ENTER AND EXIT
+    """
+
+    __slots__ = ["record", "busy", "histogram", "sample", "span"]
+
+    def __init__(self, description, record, busy, histogram, sample, span):
+        self.record = description if record is True else record
+        self.busy = busy
+        self.histogram = histogram
+        self.sample = DEFAULT_INTERVAL if sample is True else sample
+        self.span = SPANS if span is True else span or None
+
+    def enter(self, timer, start):
+        timer._watch = SAMPLER.watch(timer.too_long, self.sample) if self.sample and timer.too_long else None
+        timer._span = self.span.enter(timer.template, start) if self.span is not None else None
+
+    def exit(self, timer, end, interval):
+        if timer._span is not None:
+            self.span.exit(timer._span, end)
+            timer._span = None
+        if timer._watch is not None:
+            timer.profile = timer._watch.stop()
+            timer._watch = None
+        if self.record:
+            REGISTRY.record(self.record, interval)
+        if self.histogram is not None:
+            self.histogram.record(interval)
+
+
+class _Busy:
+    """
+    AWAIT coro, ADDING THE TIME OF EACH STEP (WHILE IT HOLDS THE EVENT LOOP) TO timer.busy
+    """
+
+    __slots__ = ["coro", "timer"]
+
+    def __init__(self, coro, timer):
+        self.coro = coro
+        self.timer = timer
+
+    def __await__(self):
+        coro, timer = self.coro, self.timer
+        timer.busy = 0.0
+        value, error = None, None
+        while True:
+            start = perf_counter_ns()
+            try:
+                if error is None:
+                    future = coro.send(value)
+                else:
+                    future = coro.throw(error)
+            except StopIteration as e:
+                return e.value
+            finally:
+                timer.busy += (perf_counter_ns() - start) / 1e9
+            try:
+                value, error = (yield future), None
+            except BaseException as e:
+                value, error = None, e
@@ -0,0 +1,233 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# BENCHMARKS OF THE mo-times HOT PATHS, WITH A REGRESSION CHECK
+#
+# RUN WITH
+#     python -m tests.benchmark --output new.json [--filter floor]
+#     python -m tests.benchmark compare baseline.json new.json [--threshold 0.2]
+#
+# EACH BENCHMARK IS TIMED IN repeat RUNS OF ENOUGH LOOPS TO TAKE min_time; THE
+# FASTEST RUN IS REPORTED (IN NANOSECONDS PER CALL), BECAUSE NOISE ONLY EVER
+# MAKES A RUN SLOWER
+#
+import argparse
+import json
+import platform
+import sys
+from datetime import date, datetime, timezone
+from statistics import median
+
+from mo_times import DAY, Date, Duration, MONTH, Timer, YEAR
+from mo_times.dates import _deformats, unicode2Date
+from mo_times.durations import COMMON_INTERVALS, _parsed, parse
+from mo_times.latency import LatencyHistogram
+from mo_times.spans import SpanRecorder
+
+SAMPLE = datetime(2023, 7, 14, 13, 45, 30, 123456, tzinfo=timezone.utc)
+
+
+def benchmarks():
+    """
+    RETURN LIST OF (name, function OF NO ARGUMENTS)
+    """
+    output = []
+
+    def add(name, func):
+        output.append((name, func))
+
+    # Date() FROM EACH INPUT TYPE
+    unix = SAMPLE.timestamp()
+    existing = Date(unix)
+    for name, value in [
+        ("float", unix),
+        ("int", int(unix)),
+        ("millis", int(unix * 1000)),
+        ("Date", existing),
+        ("datetime", SAMPLE),
+        ("date", date(2023, 7, 14)),
+        ("iso str", "2023-07-14T13:45:30Z"),
+        ("expression", "today-week"),
+    ]:
+        add(f"Date({name})", lambda v=value: Date(v))
+
+    # EVERY _deformats ENTRY
+    for format in _deformats:
+        text = SAMPLE.strftime(format.replace("|", "/" if "T" in format else " "))
+        unicode2Date(text)  # FAIL NOW, NOT WHILE TIMING
+        add(f"unicode2Date({format})", lambda t=text: unicode2Date(t))
+
+    for format in ["%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S.%fZ", "%d %B %Y", "%A"]:
+        add(f"format({format})", lambda f=format: existing.format(f))
+
+    for interval in COMMON_INTERVALS:
+        add(f"floor({interval})", lambda i=interval: existing.floor(i))
+
+    for interval in [MONTH, Duration("3month"), YEAR, DAY]:
+        add(f"add({interval})", lambda i=interval: existing.add(i))
+
+    # Duration
+    fifteen = Duration("15minute")
+    add("Duration(str) cached", lambda: Duration("15minute"))
+    # FORGET ONLY OUR OWN STRING, SO OTHER FLYWEIGHTS ARE KEPT
+    add("Duration(str) uncached", lambda: (_parsed.pop("15minute+30second", None), parse("15minute+30second")))
+    add("Duration(float)", lambda: Duration(900.0))
+    add("str(Duration)", lambda: str(fifteen))
+    add("Duration + Duration", lambda: fifteen + fifteen)
+    add("Duration * int", lambda: fifteen * 4)
+    add("Duration / Duration", lambda: DAY / fifteen)
+    add("Date - Date", lambda: existing - existing)
+    add("Date + Duration", lambda: existing + fifteen)
+
+    # COMPARISONS
+    other = Date(unix + 1)
+    add("Date < Date", lambda: existing < other)
+    add("Date == float", lambda: existing == unix)
+    add("Date < str", lambda: existing < "2024-01-01")
+
+    # Timer OVERHEAD
+    histogram = LatencyHistogram()
+    spans = SpanRecorder()
+    for name, kwargs in [
+        ("silent", {}),
+        ("histogram", {"histogram": histogram}),
+        ("span", {"span": spans}),
+    ]:
+        add(f"Timer({name})", lambda k=kwargs: _timed(k))
+
+    return output
+
+
+def _timed(kwargs):
+    with Timer("benchmark", silent=True, **kwargs):
+        pass
+
+
+def measure(func, repeat=5, min_time=0.05):
+    """
+    RETURN Data-LIKE dict(ns, median, loops) FOR func
+    """
+    loops = 1
+    while True:
+        elapsed = _run(func, loops)
+        if elapsed >= min_time:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+    runs = [elapsed] + [_run(func, loops) for _ in range(repeat - 1)]
+    per_call = [r * 1e9 / loops for r in runs]
+    return {"ns": round(min(per_call), 1), "median": round(median(per_call), 1), "loops": loops}
+
+
+def _run(func, loops):
+    with Timer("run", silent=True) as timer:
+        for _ in range(loops):
+            func()
+    return timer.interval
+
+
+def run(filter=None, repeat=5, min_time=0.05, log=None):
+    """
+    RUN THE BENCHMARKS (WITH filter IN THEIR NAME); RETURN JSON-ABLE dict
+    """
+    results = {}
+    for name, func in benchmarks():
+        if filter and filter not in name:
+            continue
+        results[name] = measure(func, repeat, min_time)
+        if log:
+            log(f"{name:45} {results[name]['ns']:>12,.1f} ns")
+    return {
+        "date": Date.now().format(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    RETURN LIST OF dict(name, baseline, current, ratio, status) FOR EVERY BENCHMARK IN EITHER
+    status IS "regression" WHEN current IS MORE THAN threshold SLOWER, "faster", "same", "new" OR "missing"
+    """
+    before, after = baseline["results"], current["results"]
+    output = []
+    for name in list(before) + [n for n in after if n not in before]:
+        old, new = before.get(name), after.get(name)
+        if old is None:
+            output.append({"name": name, "baseline": None, "current": new["ns"], "ratio": None, "status": "new"})
+            continue
+        if new is None:
+            output.append({"name": name, "baseline": old["ns"], "current": None, "ratio": None, "status": "missing"})
+            continue
+        ratio = new["ns"] / old["ns"] if old["ns"] else 1.0
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "faster"
+        else:
+            status = "same"
+        output.append({"name": name, "baseline": old["ns"], "current": new["ns"], "ratio": ratio, "status": status})
+    return output
+
+
+def _report(rows):
+    lines = [f"{'benchmark':45} {'baseline':>12} {'current':>12} {'ratio':>7}  status"]
+    for row in rows:
+        old = "" if row["baseline"] is None else f"{row['baseline']:,.1f}"
+        new = "" if row["current"] is None else f"{row['current']:,.1f}"
+        ratio = "" if row["ratio"] is None else f"{row['ratio']:.2f}"
+        lines.append(f"{row['name']:45} {old:>12} {new:>12} {ratio:>7}  {row['status']}")
+    return "\n".join(lines)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmark", description=__doc__)
+    commands = parser.add_subparsers(dest="command")
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="fraction slower that is a regression")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="also compare the results to this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="fraction slower that is a regression")
+    parser.add_argument("--filter", help="only run benchmarks with this in their name")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds for each run")
+    options = parser.parse_args(args)
+
+    if options.command == "compare":
+        current = _load(options.current)
+    else:
+        current = run(options.filter, options.repeat, options.min_time, log=print)
+        if options.output:
+            with open(options.output, "w") as file:
+                json.dump(current, file, indent=2)
+        if not options.baseline:
+            return 0
+
+    baseline = _load(options.baseline)
+    if options.command != "compare" and options.filter:
+        # ONLY THE BENCHMARKS THAT WERE RUN
+        baseline["results"] = {k: v for k, v in baseline["results"].items() if options.filter in k}
+    rows = compare(baseline, current, options.threshold)
+    print(_report(rows))
+    regressions = [r["name"] for r in rows if r["status"] == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def _load(filename):
+    with open(filename) as file:
+        return json.load(file)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# RUN WITH  python -m unittest tests.speedtest_arrays
+#
+import numpy as np
+from mo_logs import logger
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_times import Date, HOUR, MONTH, Timer
+from mo_times.arrays import DateArray
+
+
+class SpeedTestArrays(FuzzyTestCase):
+    def test_bucketing(self):
+        unix = np.random.default_rng(42).uniform(0, 2_000_000_000, 10_000_000).round(3)
+        sample = [Date(u) for u in unix[:100_000].tolist()]
+        dates = DateArray.from_unix(unix)
+
+        for interval in [HOUR, MONTH]:
+            with Timer("scalar floor {interval} (100K)", param={"interval": interval}, silent=True) as scalar:
+                expected = [d.floor(interval).unix for d in sample]
+            with Timer("vector floor {interval} (10M)", param={"interval": interval}, silent=True) as vector:
+                result = dates.floor(interval)
+
+            self.assertEqual(result.unix[:100_000].tolist(), expected)
+            logger.info(
+                "{{interval}}: 10M vectorized in {{vector}}, scalar would take {{scalar}}",
+                interval=str(interval),
+                vector=vector.duration,
+                scalar=scalar.duration * 100,
+            )
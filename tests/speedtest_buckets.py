@@ -0,0 +1,68 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# RUN WITH  python -m unittest tests.speedtest_buckets
+#
+from collections import defaultdict
+
+from mo_logs import logger
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_times import HOUR, MONTH, Timer
+from mo_times.buckets import TimeBuckets, best_interval
+from mo_times.dates import unix2Date
+from mo_times.durations import COMMON_INTERVALS
+
+
+class SpeedTestBuckets(FuzzyTestCase):
+    def test_stream(self):
+        # A STREAM, MOSTLY IN ORDER
+        values = [unix2Date(1_700_000_000 + i * 0.5 + (i % 7) * 10) for i in range(1_000_000)]
+        for interval in [HOUR, MONTH]:
+            with Timer("floor() and dict", silent=True) as slow:
+                expected = defaultdict(int)
+                for d in values:
+                    expected[d.floor(interval).unix] += 1
+            with Timer("TimeBuckets.extend()", silent=True) as fast:
+                buckets = TimeBuckets(interval)
+                buckets.extend(values)
+            self.assertEqual({b.start.unix: b.count for b in buckets.buckets}, dict(expected))
+            logger.info(
+                "{{interval}}: TimeBuckets is {{ratio|round(places=2)}}x faster",
+                interval=str(interval),
+                ratio=slow.duration.seconds / fast.duration.seconds,
+            )
+
+    def test_best_interval(self):
+        ranges = [(unix2Date(1_600_000_000.0), unix2Date(1_600_000_000 + 60.0 * 1.5**i)) for i in range(30)] * 1000
+
+        def scan(min, max, target):
+            # THE OLD WAY: DIVIDE THE SPAN BY EVERY INTERVAL
+            span = max - min
+            best, best_error = None, None
+            for interval in COMMON_INTERVALS:
+                try:
+                    error = abs(span / interval - target)
+                except Exception:
+                    continue  # Duration.__div__ CAN NOT HANDLE ALL SPANS
+                if best is None or error < best_error:
+                    best, best_error = interval, error
+            return best
+
+        with Timer("scan COMMON_INTERVALS", silent=True) as slow:
+            for min, max in ranges:
+                scan(min, max, 50)
+        with Timer("best_interval", silent=True) as fast:
+            for min, max in ranges:
+                best_interval(min, max, 50)
+        logger.info(
+            "best_interval is {{ratio|round(places=2)}}x faster ({{rate|round(digits=3)}} calls/sec)",
+            ratio=slow.duration.seconds / fast.duration.seconds,
+            rate=len(ranges) / fast.duration.seconds,
+        )
@@ -0,0 +1,189 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# RUN WITH  python -m unittest tests.speedtest_date
+#
+import sys
+from datetime import datetime
+from random import Random
+
+from mo_logs import logger
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_threads import Thread, join_all_threads
+
+from mo_times import Date, MONTH, Timer
+from mo_times.dates import ISO8601, RFC1123, _iso2unix, cache_parsing, datetime2unix, unix2Date, unix2datetime
+from mo_times.formatter import compile_format
+from tests.test_civil import old_add, old_floor
+
+
+class SpeedTestDate(FuzzyTestCase):
+    def test_iso_parsing(self):
+        rand = Random(42)
+        values = [
+            f"{rand.randint(1970, 2100)}-{rand.randint(1, 12):02d}-{rand.randint(1, 28):02d}T"
+            f"{rand.randint(0, 23):02d}:{rand.randint(0, 59):02d}:{rand.randint(0, 59):02d}"
+            f".{rand.randint(0, 999999):06d}Z"
+            for _ in range(100_000)
+        ]
+
+        with Timer("strptime", verbose=True) as slow:
+            expected = [datetime2unix(datetime.strptime(v, "%Y-%m-%dT%H:%M:%S.%f%z")) for v in values]
+        with Timer("iso fast path", verbose=True) as fast:
+            result = [_iso2unix(v) for v in values]
+
+        self.assertEqual(result, expected)
+        logger.info(
+            "iso fast path is {{ratio|round(places=2)}}x faster", ratio=slow.duration.seconds / fast.duration.seconds
+        )
+        self.assertLess(fast.duration.seconds, slow.duration.seconds)
+
+    def test_parse_scaling(self):
+        values = ["3 jan 2024", "20-01-2023", "January 3, 2024", "2023/01/02 10:11:12"] * 5_000
+        gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+        def parser(please_stop):
+            for v in values:
+                Date(v)
+
+        single = None
+        for num_threads in [1, 2, 4, 8]:
+            with Timer("parse with {threads} threads", param={"threads": num_threads}, silent=True) as timer:
+                join_all_threads([Thread.run(str(i), parser) for i in range(num_threads)])
+            rate = num_threads * len(values) / timer.duration.seconds
+            single = single or rate
+            logger.info(
+                "{{threads}} threads (gil={{gil}}): {{rate|round(digits=3)}} parses/sec ({{speedup|round(places=2)}}x)",
+                threads=num_threads,
+                gil=gil,
+                rate=rate,
+                speedup=rate / single,
+            )
+
+    def test_parse_many(self):
+        values = [f"{1 + i % 28} jan 20{i % 30:02d}" for i in range(50_000)]
+
+        with Timer("Date() per row", verbose=True) as slow:
+            expected = [Date(v).unix for v in values]
+        with Timer("Date.parse_many()", verbose=True) as fast:
+            result = Date.parse_many(values)
+
+        self.assertEqual(result.tolist(), expected)
+        logger.info(
+            "parse_many is {{ratio|round(places=2)}}x faster", ratio=slow.duration.seconds / fast.duration.seconds
+        )
+
+    def test_parse_cache(self):
+        values = [f"{1 + i % 28} jan 2024" for i in range(100_000)]
+        with Timer("no cache", verbose=True) as slow:
+            expected = [Date(v).unix for v in values]
+        cache = cache_parsing(1000)
+        try:
+            with Timer("with cache", verbose=True) as fast:
+                result = [Date(v).unix for v in values]
+        finally:
+            cache_parsing(0)
+
+        self.assertEqual(result, expected)
+        logger.info(
+            "cache is {{ratio|round(places=2)}}x faster ({{hits}} hits, {{misses}} misses)",
+            ratio=slow.duration.seconds / fast.duration.seconds,
+            hits=cache.hits,
+            misses=cache.misses,
+        )
+
+    def test_month_bucketing(self):
+        rand = Random(42)
+        values = [unix2Date(rand.uniform(0, 2_000_000_000)) for _ in range(100_000)]
+
+        with Timer("floor(MONTH) through datetime", silent=True) as slow:
+            expected = [old_floor(d.unix, MONTH) for d in values]
+        with Timer("floor(MONTH) with civil arithmetic", silent=True) as fast:
+            result = [d.floor(MONTH).unix for d in values]
+        self.assertEqual(result, expected)
+        logger.info(
+            "floor(MONTH) is {{ratio|round(places=2)}}x faster", ratio=slow.duration.seconds / fast.duration.seconds
+        )
+
+        with Timer("add(MONTH) through datetime", silent=True) as slow:
+            expected = [old_add(d.unix, MONTH) for d in values]
+        with Timer("add(MONTH) with civil arithmetic", silent=True) as fast:
+            result = [d.add(MONTH).unix for d in values]
+        self.assertEqual(result, expected)
+        logger.info(
+            "add(MONTH) is {{ratio|round(places=2)}}x faster", ratio=slow.duration.seconds / fast.duration.seconds
+        )
+
+    def test_sort(self):
+        rand = Random(42)
+        values = [unix2Date(rand.uniform(0, 2_000_000_000)) for _ in range(1_000_000)]
+
+        with Timer("sorted() with Date.__lt__", silent=True) as slow:
+            expected = sorted(values)
+        with Timer("Date.sort()", silent=True) as fast:
+            result = Date.sort(values)
+        self.assertEqual([d.unix for d in result], [d.unix for d in expected])
+        logger.info(
+            "Date.sort is {{ratio|round(places=2)}}x faster", ratio=slow.duration.seconds / fast.duration.seconds
+        )
+
+    def test_compare_mixed(self):
+        rand = Random(42)
+        values = [unix2Date(rand.uniform(0, 2_000_000_000)) for _ in range(100_000)]
+        pivot = "2020-01-01T00:00:00Z"
+
+        with Timer("compare to Date(str)", silent=True) as slow:
+            expected = [v < Date(pivot) for v in values]
+        with Timer("compare to str", silent=True) as fast:
+            result = [v < pivot for v in values]
+        self.assertEqual(result, expected)
+        logger.info(
+            "comparing {{num}} Dates to a str: {{rate|round(digits=3)}} compares/sec"
+            " ({{ratio|round(places=2)}}x faster)",
+            num=len(values),
+            rate=len(values) / fast.duration.seconds,
+            ratio=slow.duration.seconds / fast.duration.seconds,
+        )
+
+    def test_format(self):
+        rand = Random(42)
+        values = [unix2Date(rand.uniform(0, 2_000_000_000)) for _ in range(200_000)]
+        for format in ["%Y-%m-%d %H:%M:%S", ISO8601, RFC1123]:
+            with Timer("strftime", silent=True) as slow:
+                expected = [unix2datetime(d.unix).strftime(format) for d in values]
+            with Timer("Date.format", silent=True) as fast:
+                result = [d.format(format) for d in values]
+            with Timer("format_many", silent=True) as many:
+                bulk = Date.format_many(values, format)
+            self.assertEqual(result, expected)
+            self.assertEqual(bulk, expected)
+            logger.info(
+                "{{format|quote}}: Date.format is {{ratio|round(places=2)}}x faster,"
+                " format_many is {{bulk|round(places=2)}}x faster",
+                format=format,
+                ratio=slow.duration.seconds / fast.duration.seconds,
+                bulk=slow.duration.seconds / many.duration.seconds,
+            )
+
+    def test_format_same_second(self):
+        # LOG AND HTTP HEADERS: MANY STAMPS PER SECOND
+        values = [unix2Date(1_700_000_000 + i / 10_000) for i in range(200_000)]
+        for format in [RFC1123, "%Y-%m-%d %H:%M:%S.%f"]:
+            with Timer("strftime", silent=True) as slow:
+                expected = [unix2datetime(d.unix).strftime(format) for d in values]
+            with Timer("Date.format", silent=True) as fast:
+                result = [d.format(format) for d in values]
+            self.assertEqual(result, expected)
+            formatter = compile_format(format)
+            logger.info(
+                "{{format|quote}}: Date.format is {{ratio|round(places=2)}}x faster (hit rate {{rate|percent}})",
+                format=format,
+                ratio=slow.duration.seconds / fast.duration.seconds,
+                rate=formatter.hit_rate,
+            )
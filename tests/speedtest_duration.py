@@ -0,0 +1,44 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# RUN WITH  python -m unittest tests.speedtest_duration
+#
+from mo_logs import logger
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_times import Duration, Timer
+from mo_times.durations import _parsed, parse
+
+
+class SpeedTestDuration(FuzzyTestCase):
+    def test_construction(self):
+        num = 1_000_000
+
+        class Config:
+            interval = Duration("15minute")
+
+        config = Config()
+        with Timer("attribute lookup", silent=True) as lookup:
+            for _ in range(num):
+                config.interval
+        with Timer("Duration(str)", silent=True) as cached:
+            for _ in range(num):
+                Duration("15minute")
+        with Timer("parse (not cached)", silent=True) as uncached:
+            for _ in range(num // 100):
+                # FORGET ONLY THIS STRING; "15minute" IS A PINNED MODULE CONSTANT
+                _parsed.pop("15minute+30second", None)
+                parse("15minute+30second")
+
+        logger.info(
+            "per call: attribute {{lookup}}ns, Duration(str) {{cached}}ns, uncached parse {{uncached}}ns",
+            lookup=round(lookup.duration.seconds * 1e9 / num),
+            cached=round(cached.duration.seconds * 1e9 / num),
+            uncached=round(uncached.duration.seconds * 1e9 / (num // 100)),
+        )
@@ -0,0 +1,48 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# RUN WITH  python -m unittest tests.speedtest_intervals
+#
+from random import Random
+
+from mo_logs import logger
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_times import Timer
+from mo_times.dates import unix2Date
+from mo_times.intervals import IntervalIndex, TimeInterval
+
+
+class SpeedTestIntervals(FuzzyTestCase):
+    def test_stab(self):
+        rand = Random(42)
+        intervals = []
+        for _ in range(10_000):
+            start = rand.uniform(0, 100_000_000)
+            intervals.append(TimeInterval(unix2Date(start), unix2Date(start + rand.uniform(0, 100_000))))
+        probes = [unix2Date(rand.uniform(0, 100_000_000)) for _ in range(2_000)]
+
+        with Timer("linear scan", silent=True) as slow:
+            expected = [[i for i in intervals if p in i] for p in probes]
+        with Timer("build IntervalIndex", silent=True) as build:
+            index = IntervalIndex(intervals)
+        with Timer("stab", silent=True) as fast:
+            result = [index.stab(p) for p in probes]
+        with Timer("stab_many", silent=True) as many:
+            bulk = index.stab_many(probes)
+
+        self.assertEqual([len(r) for r in result], [len(e) for e in expected])
+        self.assertEqual([len(r) for r in bulk], [len(e) for e in expected])
+        logger.info(
+            "build {{build}}, stab is {{ratio|round(places=2)}}x faster than a scan,"
+            " stab_many is {{bulk|round(places=2)}}x",
+            build=build.duration,
+            ratio=slow.duration.seconds / fast.duration.seconds,
+            bulk=slow.duration.seconds / many.duration.seconds,
+        )
@@ -0,0 +1,45 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# RUN WITH  python -m unittest tests.speedtest_series
+#
+from bisect import bisect_right
+from random import Random
+
+from mo_logs import logger
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_times import Timer
+from mo_times.dates import unix2Date
+from mo_times.series import TimeIndex
+
+
+class SpeedTestSeries(FuzzyTestCase):
+    def test_asof(self):
+        rand = Random(42)
+        reference = [unix2Date(u) for u in sorted(rand.uniform(0, 1e9) for _ in range(1_000_000))]
+        events = [unix2Date(u) for u in sorted(rand.uniform(0, 1e9) for _ in range(200_000))]
+
+        with Timer("bisect list of Date", silent=True) as slow:
+            expected = [bisect_right(reference, e) - 1 for e in events]
+        index = TimeIndex(reference)
+        with Timer("TimeIndex.asof", silent=True) as fast:
+            result = [index.asof(e) for e in events]
+        events = TimeIndex(events)
+        with Timer("TimeIndex.asof_join", silent=True) as join:
+            joined = events.asof_join(index)
+
+        self.assertEqual(result, expected)
+        self.assertEqual(list(joined), expected)
+        logger.info(
+            "asof is {{asof|round(places=2)}}x faster,"
+            " asof_join is {{join|round(places=2)}}x faster than bisecting Dates",
+            asof=slow.duration.seconds / fast.duration.seconds,
+            join=slow.duration.seconds / join.duration.seconds,
+        )
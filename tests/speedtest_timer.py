@@ -0,0 +1,63 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# RUN WITH  python -m unittest tests.speedtest_timer
+#
+from time import perf_counter_ns
+
+from mo_logs import logger
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_times import Timer
+
+
+class _Bare:
+    """
+    THE LEAST A with-BLOCK TIMER CAN DO: READ THE CLOCK ON ENTER AND ON EXIT
+    """
+
+    __slots__ = ["start", "end"]
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.end = perf_counter_ns()
+
+
+def _per_use(make, num):
+    start = perf_counter_ns()
+    for _ in range(num):
+        with make():
+            pass
+    return (perf_counter_ns() - start) / num
+
+
+class SpeedTestTimer(FuzzyTestCase):
+    def test_silent_overhead(self):
+        num = 200_000
+
+        # FASTEST OF SEVERAL RUNS, BECAUSE NOISE ONLY EVER MAKES A RUN SLOWER
+        bare, per_use, with_param = [], [], []
+        for _ in range(7):
+            bare.append(_per_use(_Bare, num))
+            per_use.append(_per_use(lambda: Timer("request", silent=True), num))
+            with_param.append(_per_use(lambda: Timer("request {i}", param={"i": 1}, silent=True), num))
+        bare, per_use, with_param = min(bare), min(per_use), min(with_param)
+
+        logger.info(
+            "silent Timer costs {{per_use|round(digits=3)}}ns per use ({{with_param|round(digits=3)}}ns with param),"
+            " a bare with-block that reads the clock twice costs {{bare|round(digits=3)}}ns",
+            per_use=per_use,
+            with_param=with_param,
+            bare=bare,
+        )
+        # A SILENT Timer IS ONE OBJECT, PLUS THE CLOCK READS; ABOUT 2.5x THE BARE BLOCK ON CPython 3.11
+        self.assertLess(per_use / bare, 3.5)
@@ -0,0 +1,98 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from random import Random
+
+import numpy as np
+from mo_testing.fuzzytestcase import FuzzyTestCase, add_error_reporting
+
+from mo_times import Date, DAY, HOUR, MONTH, YEAR, Duration
+from mo_times.arrays import DateArray, DurationArray
+from mo_times.dates import ISO8601
+from mo_times.durations import COMMON_INTERVALS
+
+
+@add_error_reporting
+class TestArrays(FuzzyTestCase):
+    @classmethod
+    def setUpClass(cls):
+        rand = Random(42)
+        cls.unix = [float(rand.randint(-2208988800, 7258118400)) for _ in range(2000)]  # 1900 TO 2200
+        cls.unix += [u + rand.random() for u in cls.unix[:200]]
+        cls.unix += [rand.uniform(-30000000000, -9000000000) for _ in range(500)]  # FRACTIONAL, BEFORE 1685
+        cls.unix += [Date(f"2024-{m:02d}-01").unix - 1 for m in range(1, 13)]  # LAST SECOND OF EACH MONTH
+        cls.dates = [Date(u) for u in cls.unix]
+        cls.array = DateArray(cls.unix)
+
+    def test_floor(self):
+        for interval in COMMON_INTERVALS:
+            expected = [d.floor(interval).unix for d in self.dates]
+            self.assertEqual(self.array.floor(interval).unix.tolist(), expected, str(interval))
+
+    def test_ceiling(self):
+        for interval in COMMON_INTERVALS:
+            expected = [d.ceiling(interval).unix for d in self.dates]
+            self.assertEqual(self.array.ceiling(interval).unix.tolist(), expected, str(interval))
+
+    def test_add(self):
+        for duration in [DAY, -HOUR, MONTH, -MONTH, 3 * MONTH, YEAR, -YEAR, Duration("13month")]:
+            expected = [(d + duration).unix for d in self.dates]
+            actual = (self.array + duration).unix.tolist()
+            # EXACTLY, NOT FUZZY: THE LAST BIT MUST MATCH THE SCALAR PATH
+            self.assertEqual([(a, e) for a, e in zip(actual, expected) if a != e], [], str(duration))
+
+    def test_milliseconds(self):
+        millis = [1700000000123, 9999999999, 10000000000]
+        expected = [Date(m).unix for m in millis]
+        self.assertEqual(DateArray(millis).unix.tolist(), expected)
+        self.assertEqual(DateArray(np.array(millis, dtype=np.int64)).unix.tolist(), expected)
+
+    def test_add_end_of_month(self):
+        dates = DateArray(["2023-01-28", "2023-01-31", "2024-02-29", "2023-02-28 13:00:00"])
+        self.assertEqual((dates + MONTH).format(), [
+            "2023-02-28 00:00:00",
+            "2023-02-28 00:00:00",
+            "2024-03-31 00:00:00",
+            "2023-03-31 13:00:00",
+        ])
+
+    def test_add_duration_array(self):
+        durations = DurationArray([MONTH, DAY, -YEAR, HOUR] * 3)
+        dates = DateArray(self.unix[:12])
+        expected = [(d + v).unix for d, v in zip(dates, durations)]
+        self.assertEqual((dates + durations).unix.tolist(), expected)
+
+    def test_subtract(self):
+        other = Date("2020-01-01")
+        diff = self.array - other
+        self.assertIsInstance(diff, DurationArray)
+        self.assertEqual(diff.milli.tolist(), [(d - other).milli for d in self.dates])
+        self.assertEqual(((self.array - self.array) / DAY).tolist(), [0] * len(self.dates))
+
+    def test_format(self):
+        for format in ["%Y-%m-%d %H:%M:%S", ISO8601, "%Y-%m-%d", "%a, %d %b %Y"]:
+            self.assertEqual(self.array.format(format), [d.format(format) for d in self.dates], format)
+
+    def test_compare(self):
+        pivot = "2000-01-01"
+        self.assertEqual((self.array < pivot).tolist(), [d < Date(pivot) for d in self.dates])
+        self.assertEqual((self.array >= Date(pivot)).tolist(), [d >= Date(pivot) for d in self.dates])
+        self.assertFalse(np.any(self.array == None))
+
+    def test_missing(self):
+        dates = DateArray(["2024-01-01", None, "not a date"])
+        self.assertEqual(dates.format(), ["2024-01-01 00:00:00", None, None])
+        self.assertEqual(dates.floor(MONTH).format(), ["2024-01-01 00:00:00", None, None])
+        self.assertEqual(dates[1], None)
+
+    def test_datetime64(self):
+        values = np.array(["2024-01-01T10:00:00.5", "NaT"], dtype="datetime64[ms]")
+        dates = DateArray(values)
+        self.assertEqual(dates[0], Date("2024-01-01 10:00:00.5"))
+        self.assertEqual(dates.datetime64.astype("datetime64[ms]").tolist(), values.tolist())
@@ -0,0 +1,34 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from mo_testing.fuzzytestcase import FuzzyTestCase, add_error_reporting
+
+from tests.benchmark import benchmarks, compare, run
+
+
+@add_error_reporting
+class TestBenchmark(FuzzyTestCase):
+    def test_all_run(self):
+        # EVERY BENCHMARK WORKS, AT LEAST ONCE
+        for name, func in benchmarks():
+            func()
+
+    def test_run(self):
+        result = run(filter="floor(day)", repeat=2, min_time=0.001)
+        self.assertEqual(list(result["results"]), ["floor(day)"])
+        self.assertGreater(result["results"]["floor(day)"]["ns"], 0)
+
+    def test_compare(self):
+        baseline = {"results": {"a": {"ns": 100}, "b": {"ns": 100}, "c": {"ns": 100}, "gone": {"ns": 1}}}
+        current = {"results": {"a": {"ns": 130}, "b": {"ns": 110}, "c": {"ns": 50}, "added": {"ns": 1}}}
+        rows = compare(baseline, current, threshold=0.2)
+        self.assertEqual(
+            [(r["name"], r["status"]) for r in rows],
+            [("a", "regression"), ("b", "same"), ("c", "faster"), ("gone", "missing"), ("added", "new")],
+        )
@@ -0,0 +1,114 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import math
+from collections import defaultdict
+from random import Random
+
+from mo_testing.fuzzytestcase import FuzzyTestCase, add_error_reporting
+
+from mo_times import DAY, HOUR, MINUTE, MONTH, QUARTER, WEEK, Date
+from mo_times.buckets import TimeBuckets, best_interval
+from mo_times.dates import unix2Date
+from mo_times.durations import COMMON_INTERVALS
+
+
+@add_error_reporting
+class TestBuckets(FuzzyTestCase):
+    @classmethod
+    def setUpClass(cls):
+        rand = Random(42)
+        cls.dates = [unix2Date(rand.uniform(1_600_000_000, 1_700_000_000)) for _ in range(3000)]
+
+    def test_matches_floor(self):
+        for interval in COMMON_INTERVALS[6:]:
+            expected = defaultdict(int)
+            for d in self.dates:
+                expected[d.floor(interval).unix] += 1
+
+            buckets = TimeBuckets(interval)
+            buckets.extend(self.dates[:1000])
+            for d in self.dates[1000:]:
+                buckets.add(d)
+            result = {b.start.unix: b.count for b in buckets.buckets}
+            self.assertEqual(result, dict(expected), str(interval))
+
+    def test_sums_and_missing(self):
+        buckets = TimeBuckets(DAY)
+        buckets.extend(["2024-01-01 10:00:00", None, "2024-01-01 11:00:00", "2024-01-02"], [1, 2, 3, 4])
+        buckets.add(Date("2024-01-02 05:00:00"), 10)
+        self.assertEqual(buckets.buckets, [
+            {"start": Date("2024-01-01"), "end": Date("2024-01-02"), "count": 2, "sum": 4},
+            {"start": Date("2024-01-02"), "end": Date("2024-01-03"), "count": 2, "sum": 14},
+        ])
+
+    def test_weeks_and_months(self):
+        buckets = TimeBuckets(WEEK)
+        buckets.add(Date("2024-01-03"))  # WEDNESDAY
+        self.assertEqual(buckets.buckets[0].start, Date("2024-01-03").floor(WEEK))
+
+        buckets = TimeBuckets(MONTH)
+        buckets.extend([Date("2024-02-29 23:59:59"), Date("2024-03-01")])
+        self.assertEqual([b.start for b in buckets.buckets], [Date("2024-02-01"), Date("2024-03-01")])
+        self.assertEqual(buckets.buckets[0].end, Date("2024-03-01"))
+
+    def test_eviction(self):
+        closed = []
+        buckets = TimeBuckets(HOUR, lateness=HOUR, on_close=closed.append)
+        start = Date("2024-01-01")
+        for minute in range(0, 24 * 60, 7):
+            buckets.add(start + minute * MINUTE)
+        self.assertLessEqual(len(buckets), 3)
+        buckets.add(start)  # TOO LATE
+        self.assertEqual(buckets.late, 1)
+
+        buckets.close()
+        self.assertEqual(len(buckets), 0)
+        self.assertEqual(len(closed), 24)
+        self.assertEqual(sum(b.count for b in closed), len(range(0, 24 * 60, 7)))
+        self.assertEqual([b.start for b in closed], [start + h * HOUR for h in range(24)])
+
+    def test_merge(self):
+        whole = TimeBuckets(DAY)
+        whole.extend(self.dates)
+        parts = [TimeBuckets(DAY) for _ in range(3)]
+        for i, d in enumerate(self.dates):
+            parts[i % 3].add(d)
+        merged = parts[0].merge(parts[1]).merge(parts[2])
+        self.assertEqual(merged.buckets, whole.buckets)
+        with self.assertRaises(Exception):
+            merged.merge(TimeBuckets(HOUR))
+
+    def test_best_interval(self):
+        rand = Random(42)
+        for _ in range(300):
+            start = unix2Date(rand.uniform(1_000_000_000, 1_700_000_000))
+            end = unix2Date(start.unix + math.exp(rand.uniform(0, 20)))
+            target = rand.randint(1, 200)
+            result = best_interval(start, end, target)
+
+            size = (end.unix - start.unix) / target
+            ratios = [abs(math.log(_approximate(i) / size)) for i in COMMON_INTERVALS]
+            self.assertEqual(abs(math.log(_approximate(result.interval) / size)), min(ratios))
+            self.assertEqual(result.min, start.floor(result.interval))
+            self.assertLess(result.max.add(-result.interval), end)
+            self.assertGreaterEqual(result.max, end)
+            self.assertEqual(result.max, result.max.floor(result.interval))
+            self.assertEqual(result.count, len(Date.range(result.min, result.max, result.interval)))
+
+    def test_best_interval_examples(self):
+        result = best_interval("2020-01-15", "2024-03-01", 20)
+        self.assertEqual(result.interval, QUARTER)
+        self.assertEqual(result.min, Date("2020-01-01"))
+        self.assertEqual(result.max, Date("2024-04-01"))
+        self.assertEqual(result.count, 17)
+
+
+def _approximate(interval):
+    return interval.month * 365.2425 * 86400 / 12 if interval.month else interval.seconds
@@ -0,0 +1,95 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import math
+from datetime import date, datetime, timedelta
+from random import Random
+
+from mo_testing.fuzzytestcase import FuzzyTestCase, add_error_reporting
+
+from mo_times import MONTH, QUARTER, YEAR, Duration
+from mo_times.civil import civil_from_days, days_from_civil, split_unix
+from mo_times.dates import add_month, datetime2unix, set_day, unix2Date, unix2datetime
+
+MIN_UNIX = datetime2unix(datetime(2, 1, 1))
+MAX_UNIX = datetime2unix(datetime(9998, 1, 1))
+
+
+@add_error_reporting
+class TestCivil(FuzzyTestCase):
+    @classmethod
+    def setUpClass(cls):
+        rand = Random(42)
+        unix = [rand.uniform(MIN_UNIX, MAX_UNIX) for _ in range(3000)]
+        unix += [float(round(u)) for u in unix[:1000]]
+        unix += [
+            datetime2unix(datetime(y, m, 1)) - d
+            for y in range(1999, 2002)
+            for m in range(1, 13)
+            for d in (1, 0.0000004, 86400)
+        ]
+        unix += [datetime2unix(datetime(2024, 2, 29, 23, 59, 59, 999999)) + 0.0000006]
+        cls.unix = unix
+
+    def test_days_from_civil(self):
+        for ordinal in range(date(1, 1, 1).toordinal(), date(9999, 12, 31).toordinal(), 97):
+            d = date.fromordinal(ordinal)
+            days = ordinal - date(1970, 1, 1).toordinal()
+            self.assertEqual(days_from_civil(d.year, d.month, d.day), days)
+            self.assertEqual(civil_from_days(days), (d.year, d.month, d.day))
+
+    def test_split_unix(self):
+        for u in self.unix:
+            seconds, micro = split_unix(u)
+            expected = utcfromtimestamp_parts(u)
+            self.assertEqual((seconds, micro), expected, u)
+
+    def test_year(self):
+        for u in self.unix:
+            self.assertEqual(unix2Date(u).year, unix2datetime(u).year, u)
+
+    def test_add_day(self):
+        for u in self.unix:
+            expected = datetime2unix(unix2datetime(u) + timedelta(days=1))
+            self.assertEqual(unix2Date(u).add_day().unix, expected, u)
+
+    def test_floor(self):
+        for duration in [MONTH, 2 * MONTH, QUARTER, Duration("6month"), YEAR, 2 * YEAR]:
+            for u in self.unix:
+                self.assertEqual(unix2Date(u).floor(duration).unix, old_floor(u, duration), u)
+
+    def test_add(self):
+        for duration in [MONTH, -MONTH, 2 * MONTH, QUARTER, -QUARTER, YEAR, -YEAR, Duration("13month")]:
+            for u in self.unix:
+                self.assertEqual(unix2Date(u).add(duration).unix, old_add(u, duration), (u, str(duration)))
+
+
+def utcfromtimestamp_parts(unix):
+    value = unix2datetime(unix)
+    return math.floor(datetime2unix(value.replace(microsecond=0))), value.microsecond
+
+
+def old_floor(unix, duration):
+    dt = unix2datetime(unix)
+    month = int(math.floor((dt.year * 12 + dt.month - 1) / duration.month) * duration.month)
+    year = int(math.floor(month / 12))
+    month -= 12 * year
+    return datetime2unix(datetime(year, month + 1, 1))
+
+
+def old_add(unix, duration):
+    value = unix2datetime(unix)
+    if (value + timedelta(days=1)).month != value.month:
+        output = add_month(value + timedelta(days=1), duration.month) - timedelta(days=1)
+    else:
+        day = value.day
+        num_days = (add_month(datetime(value.year, value.month, 1), duration.month + 1) - timedelta(days=1)).day
+        curr = set_day(value, min(day, num_days))
+        output = add_month(curr, duration.month)
+    return datetime2unix(output)
@@ -8,15 +8,31 @@
 # Author: Kyle Lahnakoski (kyle@lahnakoski.com)
 #
 
+import bisect
+import math
+from array import array
 from datetime import datetime
+from random import Random
 
 import pytz
+from mo_dots import Null
 from mo_math import MAX
 from mo_testing.fuzzytestcase import FuzzyTestCase, add_error_reporting
 from mo_threads import join_all_threads, Thread
 
-from mo_times.dates import Date
-from mo_times.durations import MONTH, YEAR, WEEK, Duration, DAY, HOUR
+from mo_times.dates import (
+    Date,
+    compile_time_expression,
+    parse_time_expression,
+    cache_parsing,
+    _shape_parsers,
+    _shape_table,
+    attempts,
+    _iso2unix,
+    unix2Date,
+    _unix,
+)
+from mo_times.durations import COMMON_INTERVALS, MONTH, YEAR, WEEK, Duration, DAY, HOUR, MAX_PARSED
 
 
 @add_error_reporting
@@ -209,3 +225,216 @@ class TestDate(FuzzyTestCase):
     def test_to_nyc_timezone_using_pytz(self):
         date = Date("2023-01-01 00:00:00").to(pytz.timezone("America/New_York"))
         self.assertEqual(date.format(), "2022-12-31 19:00:00")
+
+    def test_shape_goes_to_known_parser(self):
+        Date("3 jan 2024")
+        parser = _shape_parsers["3 jan 2024".translate(_shape_table)]
+        self.assertEqual(parser.format, "%d|%b|%Y")
+        self.assertEqual(Date("9 feb 2023"), Date("2023-02-09"))
+
+    def test_mixed_shapes(self):
+        values = ["3 jan 2024", "20-01-2023", "2024-02-16", "2024-02-16 10:11:12", "January 3, 2024"] * 3
+        expected = [1704240000, 1674172800, 1708041600, 1708078272, 1704240000] * 3
+        self.assertEqual([Date(v).unix for v in values], expected)
+
+    def test_shape_collision_falls_back(self):
+        key = "20-01-2023".translate(_shape_table)
+        wrong = next(a for a in attempts if a.format == "%Y|%m|%d")
+        _shape_parsers[key] = wrong
+        self.assertEqual(Date("20-01-2023"), Date("2023-01-20"))
+        self.assertEqual(_shape_parsers[key].format, "%d|%m|%Y")
+
+    def test_iso_matches_strptime(self):
+        rand = Random(42)
+        for _ in range(2000):
+            value = f"{rand.randint(1, 9999):04d}-{rand.randint(1, 12):02d}-{rand.randint(1, 28):02d}"
+            form = rand.choice(["", "T", " "])
+            if form:
+                value += f"{form}{rand.randint(0, 23):02d}:{rand.randint(0, 59):02d}:{rand.randint(0, 59):02d}"
+                if rand.random() < 0.5:
+                    value += "." + str(rand.randint(0, 999999)).zfill(6)[: rand.randint(1, 6)]
+                if form == "T":
+                    value += rand.choice(["", "Z", f"+{rand.randint(0, 23):02d}:{rand.randint(0, 59):02d}", "-0530"])
+            self.assertEqual(_iso2unix(value), _strptime2unix(value), value)
+
+    def test_iso_rejects(self):
+        for value in [
+            "2023-02-29",
+            "2023-13-01",
+            "0000-01-01",
+            "2023-01-01T24:00:00",
+            "2023-01-01T10:00:60",
+            "2023-01-01 10:00:00Z",
+            "2023-01-01T10:00:00.1234567",
+            "2023-01-01T10:00",
+            "2023-1-01",
+        ]:
+            self.assertIsNone(_iso2unix(value), value)
+
+    def test_iso_with_offset(self):
+        self.assertEqual(Date("2022-02-04T06:05:55+01:30"), Date("2022-02-04 04:35:55"))
+        self.assertEqual(Date("2022-02-04T06:05:55.5Z").unix, 1643954755.5)
+
+    def test_parse_many(self):
+        values = ["2024-02-16", "2024-02-17T10:00:00Z", "3 jan 2024", "4 jan 2024", "1700000000", " 2024-02-18 "]
+        result = Date.parse_many(values)
+        self.assertIsInstance(result, array)
+        self.assertEqual(list(result), [Date(v).unix for v in values])
+
+        # AN INTEGER STRING IS A TIMESTAMP, EVEN AFTER A ROW THAT strptime %Y%m%d%H%M%S WOULD ALSO ACCEPT
+        values = ["2024/01/02 03:04:05", "123456789", "2024/01/03 03:04:05"]
+        self.assertEqual(Date.parse_many(values).tolist(), [Date(v).unix for v in values])
+
+        # A ROW OF ANOTHER SHAPE DOES NOT CHANGE HOW "20070202" IS READ
+        _shape_parsers.clear()
+        Date("2007/02/02")  # %Y|%m|%d FIRST, SO "20070202" IS 2007-02-02
+        values = ["20070202", "20-01-2023", "20070202"]
+        result = Date.parse_many(values)
+        self.assertEqual(result.tolist(), [Date(v).unix for v in values])
+        self.assertEqual(result[2], Date("2007-02-02").unix)
+
+    def test_parse_many_mixed_types(self):
+        failures = []
+        result = Date.parse_many(["2024-01-01", 1700000000, Date("2024-01-02"), object()], failures=failures)
+        self.assertEqual(result[:3].tolist(), [Date("2024-01-01").unix, 1700000000, Date("2024-01-02").unix])
+        self.assertTrue(math.isnan(result[3]))
+        self.assertEqual([i for i, _ in failures], [3])
+
+    def test_parse_many_failures(self):
+        failures = []
+        result = Date.parse_many(
+            ["2024-02-16", "not a date", None, "2024-02-30", "2024-02-17", Null], failures=failures
+        )
+        self.assertEqual(failures, [(1, "not a date"), (3, "2024-02-30")])
+        self.assertTrue(math.isnan(result[5]))
+        self.assertEqual(result[0], Date("2024-02-16").unix)
+        self.assertTrue(math.isnan(result[1]))
+        self.assertTrue(math.isnan(result[2]))
+        self.assertEqual(result[4], Date("2024-02-17").unix)
+
+    def test_parse_many_with_format(self):
+        failures = []
+        result = Date.parse_many(
+            ["2024/02/16 10", "2024/02/16 11", "2024-02-16"], format="%Y/%m/%d %H", failures=failures
+        )
+        self.assertEqual(result[:2].tolist(), [1708077600, 1708081200])
+        self.assertEqual(failures, [(2, "2024-02-16")])
+
+    def test_parse_many_as_date(self):
+        result = Date.parse_many(["2024-02-16", "nope"], as_date=True)
+        self.assertEqual(result[0], Date("2024-02-16"))
+        self.assertIs(result[1], Null)
+
+    def test_ceiling_month(self):
+        self.assertEqual(Date("2024-02-14 10:00:00").ceiling(MONTH), Date("2024-03-01"))
+        self.assertEqual(Date("2024-03-01").ceiling(MONTH), Date("2024-03-01"))
+        self.assertEqual(Date("2024-02-14").ceiling(YEAR), Date("2025-01-01"))
+
+    def test_parse_cache(self):
+        cache = cache_parsing(100)
+        try:
+            first = Date("3 jan 2024")
+            self.assertIs(Date("3 jan 2024"), first)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+            Date("today-week")
+            Date("now")
+            Date("Feb. 3")  # DEPENDS ON THE CLOCK
+            self.assertEqual(len(cache), 1)
+        finally:
+            cache_parsing(0)
+
+    def test_duration_flyweight(self):
+        self.assertIs(Duration("day"), DAY)
+        self.assertIs(Duration("hour"), HOUR)
+        self.assertIs(COMMON_INTERVALS[3], Duration("minute"))
+        self.assertIs(Duration("2week+3day"), Duration("2week+3day"))
+
+    def test_duration_flyweight_full(self):
+        # FILLING THE CACHE FORGETS OTHER STRINGS, BUT NOT THE MODULE CONSTANTS
+        for i in range(MAX_PARSED + 10):
+            Duration(f"{i + 100}second")
+        self.assertIs(Duration("day"), DAY)
+        self.assertIs(Duration("15minute"), COMMON_INTERVALS[5])
+
+    def test_duration_compound(self):
+        self.assertEqual(Duration("2week+3day-1hour").milli, (17 * 24 - 1) * 3600 * 1000)
+        self.assertEqual(Duration("year-month").month, 11)
+        self.assertEqual(str(Duration("2week+3day-1hour")), "2week+2day+23hour")
+
+    def test_duration_bad_term(self):
+        with self.assertRaises(Exception):
+            Duration("2weeks")
+        with self.assertRaises(Exception):
+            Duration("2fortnight")
+
+    def test_expression_pinned_clock(self):
+        now = Date("2024-02-16 10:11:12")
+        self.assertEqual(parse_time_expression("now", now), now)
+        self.assertEqual(parse_time_expression("today", now), Date("2024-02-16"))
+        self.assertEqual(parse_time_expression("eod-2hour", now), Date("2024-02-16 22:00:00"))
+        self.assertEqual(parse_time_expression("today|month", now), Date("2024-02-01"))
+        self.assertEqual(parse_time_expression("today-2week|week", now), Date("2024-01-28"))
+        self.assertEqual(parse_time_expression("2week+day", now), Duration("15day"))
+
+    def test_expression_keeps_all_terms(self):
+        now = Date("2024-02-16")
+        self.assertEqual(parse_time_expression("today-2week-1day", now), Date("2024-02-01"))
+        self.assertEqual(parse_time_expression("today - 1month + 2day - 1hour", now), Date("2024-01-17 23:00:00"))
+
+    def test_expression_compiled_once(self):
+        expression = compile_time_expression("today-2week|week")
+        self.assertIs(compile_time_expression("today-2week|week"), expression)
+        self.assertEqual(expression.evaluate(Date("2024-02-16")), expression(Date("2024-02-16").unix))
+        self.assertEqual(Date("today-2week|week"), expression.evaluate())
+
+    def test_expression_errors(self):
+        with self.assertRaises(Exception):
+            compile_time_expression("2today")
+        with self.assertRaises(Exception):
+            compile_time_expression("week-day|day")
+        with self.assertRaises(Exception):
+            compile_time_expression("today-now")
+
+    def test_compare_mixed(self):
+        d = Date("2024-03-01 12:00:00")
+        self.assertTrue(d == "2024-03-01T12:00:00Z")
+        self.assertTrue(d < "2024-03-02")
+        self.assertTrue(d > "1 mar 2024")
+        self.assertTrue(d >= d.unix)
+        self.assertFalse(d == None)
+        self.assertFalse(d < None)
+        self.assertFalse(d < "not a date")
+        self.assertFalse(d == "not a date")
+
+    def test_unix_helper(self):
+        self.assertEqual(_unix(None), None)
+        self.assertEqual(_unix(Null), None)
+        self.assertEqual(_unix(float("nan")), None)
+        self.assertEqual(_unix(1700000000.5), 1700000000.5)
+        self.assertEqual(_unix(1700000000500.0), Date(1700000000500.0).unix)
+        self.assertEqual(_unix("2024-01-01"), Date("2024-01-01").unix)
+
+    def test_sort_and_bisect(self):
+        rand = Random(42)
+        dates = [unix2Date(rand.uniform(0, 2_000_000_000)) for _ in range(1000)]
+        dates += dates[:10]
+        expected = sorted(dates)
+        self.assertEqual(Date.sort(dates), expected)
+        self.assertEqual(Date.sort(dates, reverse=True), expected[::-1])
+        self.assertEqual(sorted(dates, key=Date.sort_key), expected)
+
+        unix = [d.unix for d in expected]
+        for d in dates[:20] + [Date("1960-01-01"), Date("2100-01-01")]:
+            self.assertEqual(Date.bisect_left(expected, d), bisect.bisect_left(unix, d.unix))
+            self.assertEqual(Date.bisect(expected, d), bisect.bisect_right(unix, d.unix))
+        self.assertEqual(Date.bisect(expected, "1990-01-01"), bisect.bisect_right(unix, Date("1990-01-01").unix))
+
+
+def _strptime2unix(value):
+    # THE PATH BEFORE THE ISO FAST PATH
+    for f in attempts:
+        try:
+            return f(value)
+        except Exception:
+            pass
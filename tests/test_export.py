@@ -0,0 +1,81 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import socket
+from urllib.request import urlopen
+
+from mo_testing.fuzzytestcase import FuzzyTestCase, add_error_reporting
+
+from mo_times.export import StatsD, prometheus, start_prometheus
+from mo_times.registry import TimerRegistry
+
+
+@add_error_reporting
+class TestExport(FuzzyTestCase):
+    def test_prometheus(self):
+        registry = TimerRegistry()
+        for v in [0.001, 0.02, 0.02, 3]:
+            registry.record("db.query", v)
+        registry.record('say "hi"', 0.5)
+
+        lines = prometheus(registry, buckets=(0.01, 0.1, 1)).split("\n")
+        self.assertEqual(lines[1], "# TYPE timer_seconds histogram")
+        self.assertIn('timer_seconds_bucket{name="db.query",le="0.01"} 1', lines)
+        self.assertIn('timer_seconds_bucket{name="db.query",le="0.1"} 3', lines)
+        self.assertIn('timer_seconds_bucket{name="db.query",le="1.0"} 3', lines)
+        self.assertIn('timer_seconds_bucket{name="db.query",le="+Inf"} 4', lines)
+        self.assertIn('timer_seconds_count{name="db.query"} 4', lines)
+        self.assertIn('timer_seconds_count{name="say \\"hi\\""} 1', lines)
+        total = [l for l in lines if l.startswith('timer_seconds_sum{name="db.query"}')][0]
+        self.assertAlmostEqual(float(total.split(" ")[1]), 3.041, places=9)
+
+    def test_http(self):
+        registry = TimerRegistry()
+        registry.record("work", 0.5)
+        server = start_prometheus(port=0, host="127.0.0.1", registry=registry)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urlopen(url, timeout=5) as response:
+                self.assertTrue(response.headers["Content-Type"].startswith("text/plain; version=0.0.4"))
+                self.assertIn('timer_seconds_count{name="work"} 1', response.read().decode("utf8"))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_statsd(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.settimeout(5)
+        try:
+            registry = TimerRegistry()
+            statsd = StatsD("127.0.0.1", listener.getsockname()[1], prefix="app.", max_packet=100, registry=registry)
+            with statsd:
+                for i in range(10):
+                    registry.record("db|query", i / 1000)
+            self.assertEqual(registry.listeners, ())
+
+            lines = []
+            while len(lines) < 10:
+                packet = listener.recv(2048)
+                self.assertLessEqual(len(packet), 100)
+                lines.extend(packet.decode("utf8").split("\n"))
+            self.assertEqual(lines[0], "app.db_query:0.0|ms")
+            self.assertEqual(lines[9], "app.db_query:9.0|ms")
+            self.assertEqual(statsd.dropped, 0)
+        finally:
+            listener.close()
+
+    def test_statsd_full(self):
+        registry = TimerRegistry()
+        statsd = StatsD(max_queue=5, registry=registry)
+        registry.add_listener(statsd.record)
+        for i in range(8):
+            registry.record("work", 0.1)
+        self.assertEqual(len(statsd.queue), 5)
+        self.assertEqual(statsd.dropped, 3)
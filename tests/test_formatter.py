@@ -0,0 +1,71 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from datetime import datetime
+from random import Random
+
+from mo_future import utcfromtimestamp
+from mo_testing.fuzzytestcase import FuzzyTestCase, add_error_reporting
+
+from mo_times import Date
+from mo_times.dates import ISO8601, RFC1123, datetime2unix, unix2Date
+from mo_times.formatter import cache_stats, compile_format, format_many
+
+FORMATS = [
+    "%Y-%m-%d %H:%M:%S",
+    ISO8601,
+    RFC1123,
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%A %B %j %p %I %y %w",
+    "%d/%b/%Y:%H:%M:%S %z %Z",
+    "100%% done %%Y",
+    "no directives",
+    "%Y%f.%f%%f",
+    "%U %W %c",  # NOT COMPILED
+]
+
+
+@add_error_reporting
+class TestFormatter(FuzzyTestCase):
+    def test_matches_strftime(self):
+        rand = Random(42)
+        low, high = datetime2unix(datetime(1, 1, 2)), datetime2unix(datetime(9999, 12, 30))
+        unix = [rand.uniform(low, high) for _ in range(2000)]
+        unix += [float(round(u)) for u in unix[:500]]
+        unix += [-0.0000004, 0.9999996, 43199.0, 43200.0, 946684799.9999999]
+        for format in FORMATS:
+            formatter = compile_format(format)
+            for u in unix:
+                self.assertEqual(formatter(u), utcfromtimestamp(u).strftime(format), (format, u))
+
+    def test_compiled_once(self):
+        self.assertIs(compile_format(RFC1123), compile_format(RFC1123))
+        self.assertIsNone(compile_format("%U").template)
+        self.assertIsNotNone(compile_format(RFC1123).template)
+
+    def test_format_many(self):
+        dates = [Date("2024-02-29 13:14:15"), None, unix2Date(0.0), 86400.5]
+        self.assertEqual(
+            format_many(dates, ISO8601), ["2024-02-29T13:14:15Z", None, "1970-01-01T00:00:00Z", "1970-01-02T00:00:00Z"]
+        )
+        self.assertEqual(Date.format_many(dates[:1]), ["2024-02-29 13:14:15"])
+
+    def test_second_cache(self):
+        formatter = compile_format("%Y-%m-%d %H:%M:%S.%f (100%%)")
+        hits, misses = formatter.hits, formatter.misses
+        base = Date("2024-05-06 07:08:09").unix
+        self.assertEqual(formatter(base + 0.25), "2024-05-06 07:08:09.250000 (100%)")
+        self.assertEqual(formatter(base + 0.5), "2024-05-06 07:08:09.500000 (100%)")
+        self.assertEqual(formatter(base + 1), "2024-05-06 07:08:10.000000 (100%)")
+        self.assertEqual(formatter.hits - hits, 1)
+        self.assertEqual(formatter.misses - misses, 2)
+
+        stats = [s for s in cache_stats() if s.format == formatter.format]
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0].hits, formatter.hits)
@@ -0,0 +1,74 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from random import Random
+
+from mo_testing.fuzzytestcase import FuzzyTestCase, add_error_reporting
+
+from mo_times import DAY, HOUR, Date
+from mo_times.dates import unix2Date
+from mo_times.intervals import IntervalIndex, TimeInterval
+
+
+@add_error_reporting
+class TestIntervals(FuzzyTestCase):
+    @classmethod
+    def setUpClass(cls):
+        rand = Random(42)
+        cls.intervals = []
+        for _ in range(2000):
+            start = float(rand.randint(0, 1_000_000))
+            length = float(rand.choice([0, 1, 10, 1000, 100_000, rand.randint(0, 500_000)]))
+            cls.intervals.append(TimeInterval(unix2Date(start), unix2Date(start + length)))
+        cls.index = IntervalIndex(cls.intervals)
+        cls.probes = [unix2Date(float(rand.randint(-1000, 1_100_000))) for _ in range(300)]
+        cls.probes += [i.min for i in cls.intervals[:50]] + [i.max for i in cls.intervals[:50]]
+
+    def test_interval(self):
+        interval = TimeInterval("2024-01-01", DAY)
+        self.assertEqual(interval.max, Date("2024-01-02"))
+        self.assertEqual(interval.duration, DAY)
+        self.assertIn(Date("2024-01-01"), interval)
+        self.assertNotIn(Date("2024-01-02"), interval)
+        self.assertTrue(interval.overlaps(TimeInterval("2024-01-01 23:00:00", HOUR)))
+        self.assertFalse(interval.overlaps(TimeInterval("2024-01-02", HOUR)))
+        self.assertEqual(interval, TimeInterval(Date("2024-01-01"), Date("2024-01-02")))
+        with self.assertRaises(Exception):
+            interval.min = Date("2023-01-01")
+        with self.assertRaises(Exception):
+            TimeInterval("2024-01-02", "2024-01-01")
+
+    def test_stab(self):
+        for t in self.probes:
+            expected = sorted((i for i in self.intervals if t in i), key=_key)
+            self.assertEqual(sorted(self.index.stab(t), key=_key), expected)
+
+    def test_overlap(self):
+        for t in self.probes:
+            query = TimeInterval(t, unix2Date(t.unix + 5000))
+            expected = sorted((i for i in self.intervals if i.overlaps(query)), key=_key)
+            self.assertEqual(sorted(self.index.overlap(query.min, query.max), key=_key), expected)
+
+    def test_stab_many(self):
+        probes = self.probes + [None]
+        result = self.index.stab_many(probes)
+        self.assertEqual(result[-1], [])
+        for t, found in zip(self.probes, result):
+            self.assertEqual(sorted(found, key=_key), sorted(self.index.stab(t), key=_key))
+
+    def test_empty(self):
+        index = IntervalIndex()
+        self.assertEqual(index.stab(Date("2024-01-01")), [])
+        result = index.stab_many([Date("2024-01-01")])
+        self.assertEqual(len(result), 1)
+        self.assertFalse(result[0])
+
+
+def _key(interval):
+    return interval.min.unix, interval.max.unix
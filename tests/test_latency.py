@@ -0,0 +1,77 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import json
+import math
+from random import Random
+
+from mo_testing.fuzzytestcase import FuzzyTestCase, add_error_reporting
+
+from mo_times import Timer
+from mo_times.latency import LatencyHistogram
+
+
+@add_error_reporting
+class TestLatency(FuzzyTestCase):
+    @classmethod
+    def setUpClass(cls):
+        rand = Random(42)
+        cls.values = [rand.lognormvariate(-6, 1.5) for _ in range(20000)]
+
+    def test_percentiles(self):
+        for digits in [1, 2, 3]:
+            histogram = LatencyHistogram(digits=digits)
+            for v in self.values:
+                histogram.record(v)
+            ordered = sorted(self.values)
+            summary = histogram.summary()
+            for p, name in [(50, "p50"), (90, "p90"), (99, "p99"), (99.9, "p999")]:
+                exact = ordered[math.ceil(p / 100 * len(ordered)) - 1]
+                self.assertAlmostEqual(summary[name], exact, delta=exact * 2 / 10**digits + 1e-6, msg=name)
+                self.assertEqual(histogram.percentile(p), summary[name])
+            self.assertEqual(summary.count, len(self.values))
+            self.assertEqual(summary.max, max(self.values))
+
+    def test_fixed_memory(self):
+        histogram = LatencyHistogram(highest=10)
+        size = len(histogram.counts)
+        for v in [0, -1, 5, 100, 1e9]:
+            histogram.record(v)
+        self.assertEqual(len(histogram.counts), size)
+        self.assertEqual(histogram.max, 1e9)
+        self.assertEqual(histogram.percentile(100), 1e9)
+
+    def test_merge_and_serialize(self):
+        whole, parts = LatencyHistogram(), [LatencyHistogram() for _ in range(3)]
+        for i, v in enumerate(self.values):
+            whole.record(v)
+            parts[i % 3].record(v)
+        merged = parts[0].copy().merge(parts[1]).merge(parts[2])
+        self.assertEqual(merged.counts.tolist(), whole.counts.tolist())
+        # total IS SUMMED IN A DIFFERENT ORDER
+        self.assertAlmostEqual(merged.total, whole.total, places=9)
+        expected = whole.summary()
+        expected.total = None
+        expected.mean = None
+        self.assertEqual(merged.summary(), expected)
+
+        copy = LatencyHistogram.deserialize(json.loads(json.dumps(whole.serialize())))
+        self.assertEqual(copy.counts.tolist(), whole.counts.tolist())
+        self.assertEqual(copy.summary(), whole.summary())
+
+        with self.assertRaises(Exception):
+            whole.merge(LatencyHistogram(digits=3))
+
+    def test_timer(self):
+        histogram = LatencyHistogram()
+        for _ in range(10):
+            with Timer("fast", silent=True, histogram=histogram):
+                pass
+        self.assertEqual(histogram.count, 10)
+        self.assertLess(histogram.percentile(99), 0.01)
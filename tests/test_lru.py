@@ -0,0 +1,45 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from mo_testing.fuzzytestcase import FuzzyTestCase, add_error_reporting
+from mo_threads import Thread, join_all_threads
+
+from mo_times.lru import LRU
+
+
+@add_error_reporting
+class TestLRU(FuzzyTestCase):
+    def test_evict_least_recent(self):
+        cache = LRU(capacity=2, shards=1)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_bounded(self):
+        cache = LRU(capacity=100)
+        for i in range(1000):
+            cache.set(i, i)
+        self.assertLessEqual(len(cache), 112)  # CAPACITY IS ROUNDED UP PER SHARD
+
+    def test_threads(self):
+        cache = LRU(capacity=50)
+
+        def worker(please_stop):
+            for i in range(2000):
+                if cache.get(i % 100) is None:
+                    cache.set(i % 100, i % 100)
+
+        join_all_threads([Thread.run(str(i), worker) for i in range(8)])
+        self.assertEqual(cache.hits + cache.misses, 16000)
+        self.assertTrue(all(cache.get(k) in (None, k) for k in range(100)))
@@ -0,0 +1,91 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from mo_testing.fuzzytestcase import FuzzyTestCase, add_error_reporting
+
+from mo_times import DAY, HOUR, MONTH, QUARTER, WEEK, YEAR, Date, Duration
+from mo_times.ranges import DateRange
+
+
+def expected_range(min, max, interval):
+    # THE OLD GENERATOR
+    output = []
+    v = min
+    while v < max:
+        output.append(v)
+        v = v + interval
+    return output
+
+
+@add_error_reporting
+class TestRanges(FuzzyTestCase):
+    def test_matches_generator(self):
+        start, end = Date("2020-01-15 10:00:00"), Date("2023-07-01")
+        for interval in [HOUR, DAY, WEEK, Duration("90minute"), MONTH, QUARTER, YEAR]:
+            result = Date.range(start, end, interval)
+            expected = expected_range(start, end, interval)
+            self.assertEqual(len(result), len(expected), str(interval))
+            self.assertEqual(list(result), expected, str(interval))
+            self.assertEqual(result[-1], expected[-1])
+            self.assertEqual(list(reversed(result)), expected[::-1])
+            self.assertEqual([d.unix for d in result[3:20:4]], [d.unix for d in expected[3:20:4]])
+
+    def test_months_from_day(self):
+        result = Date.range(Date("2024-01-31"), Date("2025-01-01"), MONTH)
+        self.assertEqual(len(result), 12)
+        self.assertEqual(result[1], Date("2024-02-29"))
+        self.assertEqual(result[2], Date("2024-03-31"))
+        self.assertEqual(result[3], Date("2024-04-30"))
+
+    def test_large(self):
+        result = Date.range(Date("2000-01-01"), Date("2100-01-01"), Duration("minute"))
+        self.assertEqual(len(result), 36525 * 24 * 60)
+        self.assertEqual(result[1_000_000], Date("2000-01-01") + 1_000_000 * Duration("minute"))
+        self.assertIn(Date("2050-06-07 08:09:00"), result)
+        self.assertNotIn(Date("2050-06-07 08:09:30"), result)
+        self.assertNotIn(Date("2100-01-01"), result)
+
+    def test_index_of(self):
+        result = Date.range(Date("2024-01-01"), Date("2025-01-01"), MONTH)
+        self.assertEqual(result.index_of(Date("2024-01-01")), 0)
+        self.assertEqual(result.index_of(Date("2024-02-29 23:59:59")), 1)
+        self.assertEqual(result.index_of(Date("2024-12-31")), 11)
+        self.assertEqual(result.index_of(Date("2025-01-01")), None)
+        self.assertEqual(result.index_of(Date("2023-12-31")), None)
+        self.assertEqual(result.index_of(None), None)
+
+        backwards = result[::-1]
+        self.assertEqual(backwards.index_of(Date("2024-12-31")), 0)
+        self.assertEqual(backwards.index_of("2024-01-01"), 11)
+
+        every_other = result[::2]
+        self.assertEqual(every_other.index_of(Date("2024-03-15")), 1)
+        self.assertEqual(every_other.index_of(Date("2024-02-15")), None)
+
+    def test_empty(self):
+        self.assertEqual(len(Date.range(Date("2024-01-02"), Date("2024-01-01"), DAY)), 0)
+        self.assertEqual(list(Date.range(Date("2024-01-01"), Date("2024-01-01"), DAY)), [])
+        with self.assertRaises(Exception):
+            DateRange(Date("2024-01-01"), Date("2024-02-01"), -DAY)
+        self.assertEqual(len(Date.range(Date("2024-01-01"), None, DAY)), 0)
+
+    def test_eq_and_hash(self):
+        result = Date.range(Date("2024-01-01"), Date("2025-01-01"), MONTH)
+        same = DateRange(result[1], result[3], MONTH)
+        self.assertTrue(result[1:3] == same)
+        self.assertEqual(hash(result[1:3]), hash(same))
+        self.assertTrue(result[::2] == DateRange("2024-01-01", "2025-01-01", Duration("2month")))
+        self.assertFalse(result == result[:-1])
+        self.assertTrue(result[5:5] == Date.range(Date("2024-01-02"), Date("2024-01-01"), DAY))
+
+        # SAME FIRST ELEMENT, BUT ANOTHER ORIGIN DAY CLAMPS DIFFERENTLY
+        from_31 = Date.range(Date("2024-01-31"), Date("2025-01-01"), MONTH)[1:]
+        from_29 = Date.range(Date("2024-02-29"), Date("2025-01-01"), MONTH)
+        self.assertEqual(from_31[0], from_29[0])
+        self.assertFalse(from_31 == from_29)
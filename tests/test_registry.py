@@ -0,0 +1,104 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import threading
+from time import sleep
+
+from mo_logs import logger
+from mo_testing.fuzzytestcase import FuzzyTestCase, add_error_reporting
+
+from mo_times import Timer
+from mo_times.registry import REGISTRY, TimerRegistry
+from tests import StructuredLogger_usingList
+
+
+@add_error_reporting
+class TestRegistry(FuzzyTestCase):
+    def test_threads(self):
+        registry = TimerRegistry()
+
+        def worker(offset):
+            for i in range(1000):
+                registry.record("work", (offset + i) / 1000)
+
+        threads = [threading.Thread(target=worker, args=(t * 1000,)) for t in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = registry.snapshot()["work"]
+        self.assertEqual(stats.count, 4000)
+        self.assertAlmostEqual(stats.total, sum(range(4000)) / 1000, places=6)
+        self.assertEqual(stats.min, 0)
+        self.assertEqual(stats.max, 3.999)
+        self.assertAlmostEqual(stats.p50, 2.0, delta=0.2)
+        self.assertAlmostEqual(stats.p90, 3.6, delta=0.2)
+
+    def test_thread_churn(self):
+        registry = TimerRegistry()
+
+        def worker(i):
+            for name in ["a", "b", "c"]:
+                registry.record(name, i / 1000)
+
+        for i in range(200):
+            thread = threading.Thread(target=worker, args=(i,))
+            thread.start()
+            thread.join()
+            # EXITED THREADS ARE FOLDED INTO ONE ACCUMULATOR
+            self.assertLessEqual(len(registry.threads), 2)
+
+        snapshot = registry.snapshot()
+        self.assertEqual(len(registry.threads), 0)
+        self.assertEqual(snapshot["a"].count, 200)
+        self.assertAlmostEqual(snapshot["c"].total, sum(range(200)) / 1000, places=6)
+        self.assertEqual(snapshot["b"].max, 0.199)
+
+    def test_reset(self):
+        registry = TimerRegistry()
+        registry.record("a", 1.0)
+        self.assertEqual(registry.snapshot(reset=True)["a"].count, 1)
+        self.assertEqual(registry.snapshot(), {})
+        registry.record("a", 2.0)
+        self.assertEqual(registry.snapshot()["a"].total, 2.0)
+
+    def test_timer_records(self):
+        REGISTRY.reset()
+        for i in range(10):
+            with Timer("query {i}", param={"i": i}, silent=True, record=True):
+                pass
+        with Timer("other", silent=True, record="db.query"):
+            pass
+        snapshot = REGISTRY.snapshot(reset=True)
+        self.assertEqual(snapshot["query {i}"].count, 10)
+        self.assertEqual(snapshot["db.query"].count, 1)
+
+    def test_log_summary(self):
+        logger.main_log, temp = StructuredLogger_usingList(), logger.main_log
+        try:
+            registry = TimerRegistry()
+            registry.record("db.query", 0.5)
+            registry.log_summary()
+            self.assertEqual(len(logger.main_log.lines), 1)
+            self.assertIn("db.query", logger.main_log.lines[0])
+        finally:
+            logger.main_log = temp
+
+    def test_periodic_summary(self):
+        logger.main_log, temp = StructuredLogger_usingList(), logger.main_log
+        try:
+            registry = TimerRegistry()
+            registry.record("db.query", 0.5)
+            registry.start_summary(interval=0.05)
+            sleep(0.2)
+            registry.stop_summary()
+            self.assertEqual(len(logger.main_log.lines), 1)  # RESET AFTER EACH SUMMARY, SO ONLY ONE IS NOT EMPTY
+        finally:
+            logger.main_log = temp
@@ -0,0 +1,65 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from random import Random
+
+from mo_testing.fuzzytestcase import FuzzyTestCase, add_error_reporting
+
+from mo_times import Date, SECOND
+from mo_times.dates import unix2Date
+from mo_times.series import TimeIndex
+
+
+@add_error_reporting
+class TestSeries(FuzzyTestCase):
+    @classmethod
+    def setUpClass(cls):
+        rand = Random(42)
+        cls.unix = sorted(float(rand.randint(0, 100_000)) for _ in range(2000))
+        cls.index = TimeIndex(unix2Date(u) for u in cls.unix)
+        cls.probes = [float(rand.randint(-100, 100_100)) for _ in range(500)] + cls.unix[:50]
+
+    def test_asof(self):
+        for p in self.probes:
+            expected = max((i for i, u in enumerate(self.unix) if u <= p), default=None)
+            self.assertEqual(self.index.asof(unix2Date(p)), expected, p)
+
+    def test_range(self):
+        for a, b in zip(self.probes, self.probes[1:]):
+            expected = [i for i, u in enumerate(self.unix) if a <= u < b]
+            self.assertEqual(list(self.index.range(unix2Date(a), unix2Date(b))), expected)
+
+    def test_nearest(self):
+        for p in self.probes:
+            distance = min(abs(u - p) for u in self.unix)
+            expected = min(i for i, u in enumerate(self.unix) if abs(u - p) == distance)
+            self.assertEqual(self.index.nearest(p), expected)
+            self.assertEqual(self.index.nearest(p, tolerance=10 * SECOND), expected if distance <= 10 else None)
+
+    def test_asof_join(self):
+        other = TimeIndex.from_unix(self.unix[::7])
+        events = TimeIndex.from_unix(sorted(self.probes))
+        result = events.asof_join(other)
+        self.assertEqual(result.typecode, "q")
+        self.assertEqual(list(result), [-1 if other.asof(p) is None else other.asof(p) for p in sorted(self.probes)])
+
+        limited = events.asof_join(other, tolerance=SECOND)
+        for p, i in zip(sorted(self.probes), limited):
+            j = other.asof(p)
+            self.assertEqual(i, j if j is not None and p - other.unix[j] <= 1 else -1)
+
+    def test_basics(self):
+        index = TimeIndex(["2024-01-01", "2024-01-02", "2024-01-02"])
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index[1], Date("2024-01-02"))
+        self.assertEqual(index.asof("2024-01-02"), 2)
+        self.assertEqual(index.asof("2023-12-31"), None)
+        self.assertEqual(TimeIndex().nearest("2024-01-01"), None)
+        with self.assertRaises(Exception):
+            TimeIndex(["2024-01-02", "2024-01-01"])
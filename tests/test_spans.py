@@ -0,0 +1,104 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import asyncio
+import json
+import threading
+from time import sleep
+
+from mo_testing.fuzzytestcase import FuzzyTestCase, add_error_reporting
+
+from mo_times import Timer
+from mo_times.spans import SpanRecorder
+
+
+@add_error_reporting
+class TestSpans(FuzzyTestCase):
+    def test_self_and_child_time(self):
+        spans = SpanRecorder()
+        for _ in range(3):
+            with Timer("request", silent=True, span=spans):
+                with Timer("parse", silent=True, span=spans):
+                    sleep(0.01)
+                with Timer("query", silent=True, span=spans):
+                    sleep(0.02)
+
+        request = spans.tree().children["request"]
+        parse, query = request.children["parse"], request.children["query"]
+        self.assertEqual([request.count, parse.count, query.count], [3, 3, 3])
+        self.assertGreaterEqual(parse.total_time, 0.03 * 1e9)
+        self.assertGreaterEqual(query.total_time, 0.06 * 1e9)
+        self.assertEqual(request.self_time, request.total_time - parse.total_time - query.total_time)
+        self.assertLess(request.self_time, parse.total_time)
+
+        lines = spans.collapsed().split("\n")
+        self.assertEqual([l.rsplit(" ", 1)[0] for l in lines][-2:], ["request;parse", "request;query"])
+        self.assertGreaterEqual(int(lines[-1].rsplit(" ", 1)[1]), 60_000)
+
+    def test_threads_and_tasks(self):
+        spans = SpanRecorder()
+
+        @Timer("job", silent=True, span=spans)
+        async def job():
+            await asyncio.sleep(0.01)
+            with Timer("step", silent=True, span=spans):
+                await asyncio.sleep(0.01)
+
+        async def main():
+            with Timer("main", silent=True, span=spans):
+                await asyncio.gather(job(), job())
+
+        def worker():
+            asyncio.run(main())
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        main_node = spans.tree().children["main"]
+        self.assertEqual(main_node.count, 2)
+        self.assertEqual(main_node.children["job"].count, 4)
+        self.assertEqual(main_node.children["job"].children["step"].count, 4)
+        self.assertEqual(list(spans.tree().children), ["main"])
+
+        # THE TWO jobS RUN CONCURRENTLY, SO main WAS NOT WAITING ON ONE PLUS THE OTHER
+        job_node = main_node.children["job"]
+        self.assertGreater(job_node.total_time, main_node.total_time)
+        self.assertGreaterEqual(main_node.self_time, 0)
+        self.assertLess(main_node.self_time, main_node.total_time / 2)
+        self.assertGreaterEqual(job_node.self_time, 0)
+
+    def test_thread_churn(self):
+        spans = SpanRecorder()
+
+        def worker():
+            with Timer("task", silent=True, span=spans):
+                pass
+
+        for _ in range(100):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+            self.assertLessEqual(len(spans.threads), 2)
+        self.assertEqual(spans.tree().children["task"].count, 100)
+
+    def test_chrome_trace(self):
+        spans = SpanRecorder(trace_size=2)
+        for name in ["a", "b", "c"]:
+            with Timer(name, silent=True, span=spans):
+                pass
+        trace = json.loads(json.dumps(spans.chrome_trace()))
+        self.assertEqual([e["name"] for e in trace["traceEvents"]], ["b", "c"])
+        self.assertEqual(trace["traceEvents"][0]["ph"], "X")
+
+        spans.reset()
+        self.assertEqual(len(spans.chrome_trace()["traceEvents"]), 0)
+        self.assertEqual(len(spans.tree().children), 0)
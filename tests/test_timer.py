@@ -1,9 +1,13 @@
-from time import sleep
+import asyncio
+from threading import Lock, Thread
+from time import sleep, time
 from unittest import TestCase
 
+from mo_dots import Null
 from mo_logs import logger
 
-from mo_times import Timer
+from mo_times import Date, Timer
+from mo_times.sampler import Sampler, Watch
 from tests import StructuredLogger_usingList
 
 
@@ -18,6 +22,17 @@ class TestTimer(TestCase):
         self.assertTrue(logger.main_log.lines[1].startswith("Timer end  : test 10 (took 0"))
         logger.main_log = temp
 
+    def test_null_param_and_verbose(self):
+        logger.main_log, temp = StructuredLogger_usingList(), logger.main_log
+        try:
+            # A MISSING SETTING IS Null, AND FALLS BACK TO THE DEFAULT (LOG)
+            with Timer("null {i}", param=Null, verbose=Null):
+                pass
+        finally:
+            log, logger.main_log = logger.main_log, temp
+        self.assertEqual(log.lines[0], "Timer start: null ")
+        self.assertTrue(log.lines[1].startswith("Timer end  : null  (took 0"))
+
     def test_timer_too_long(self):
         logger.main_log, temp = StructuredLogger_usingList(), logger.main_log
         with Timer("test {i}", param=dict(i=10), verbose=True, too_long=0.1) as timer:
@@ -35,3 +50,106 @@ class TestTimer(TestCase):
 
         self.assertEqual(len(logger.main_log.lines), 0)
         logger.main_log = temp
+
+    def test_decorator(self):
+        log = StructuredLogger_usingList()
+        logger.main_log, temp = log, logger.main_log
+
+        @Timer("load {name} ({size})", verbose=True)
+        def load(name, size=3):
+            return name * size
+
+        try:
+            self.assertEqual(load("a"), "aaa")
+            self.assertEqual(load(name="b", size=1), "b")
+        finally:
+            logger.main_log = temp
+        self.assertEqual(log.lines[0], "Timer start: load a (3)")
+        self.assertTrue(log.lines[1].startswith("Timer end  : load a (3) (took 0"))
+        self.assertEqual(log.lines[2], "Timer start: load b (1)")
+        self.assertGreater(load.timer.total.seconds, 0)
+
+    def test_async(self):
+        @Timer("sleepy", silent=True, busy=True)
+        async def sleepy():
+            await asyncio.sleep(0.1)
+            return 42
+
+        async def main():
+            async with Timer("block", silent=True) as block:
+                result = await sleepy()
+            return block, result
+
+        block, result = asyncio.run(main())
+        self.assertEqual(result, 42)
+        self.assertGreaterEqual(block.duration.seconds, 0.1)
+        self.assertGreaterEqual(sleepy.timer.duration.seconds, 0.1)
+        self.assertLess(sleepy.timer.busy, 0.05)  # MOSTLY WAITING, NOT HOLDING THE LOOP
+
+    def test_async_error(self):
+        @Timer("failing", silent=True, busy=True)
+        async def failing():
+            await asyncio.sleep(0)
+            raise ValueError("expected")
+
+        with self.assertRaises(ValueError):
+            asyncio.run(failing())
+        self.assertIsNotNone(failing.timer.interval)
+
+    def test_sample_too_long(self):
+        log = StructuredLogger_usingList()
+        logger.main_log, temp = log, logger.main_log
+
+        def slow_part():
+            sleep(0.3)
+
+        try:
+            with Timer("slow", verbose=True, too_long=0.1, sample=0.01) as slow:
+                slow_part()
+            with Timer("fast", verbose=True, too_long=0.1, sample=True) as fast:
+                pass
+        finally:
+            logger.main_log = temp
+        self.assertIn("slow_part", slow.profile)
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in slow.profile.split("\n")))
+        self.assertIn("slow_part", log.lines[1])
+        self.assertIsNone(fast.profile)
+        self.assertEqual(log.lines[2], "Timer start: fast")
+        self.assertEqual(len(log.lines), 3)
+
+    def test_start_end_wall_clock(self):
+        before = time()
+        with Timer("wall", silent=True) as timer:
+            sleep(0.01)
+        after = time()
+        self.assertLessEqual(before - 0.01, timer.start)
+        self.assertLessEqual(timer.start, timer.end)
+        self.assertLessEqual(timer.end, after + 0.01)
+        self.assertAlmostEqual(Date(timer.start).unix, before, delta=1)
+
+        timer.start = timer.end - 5
+        self.assertAlmostEqual(timer.end - timer.start, 5, delta=0.001)
+
+    def test_sampler_skips_quick_blocks(self):
+        sampler = Sampler(tick=0.05)
+        # WAKES THE IDLE WORKER, BUT FINISHES WITHIN A tick, SO IS NEVER PUSHED ONTO THE HEAP
+        quick = sampler.watch(20)
+        sleep(0.01)
+        quick.stop()
+        sleep(0.1)
+        self.assertEqual(next(sampler.order), 0)
+        self.assertEqual(len(sampler.pending), 0)
+
+    def test_stop_waits_for_sample(self):
+        lock = Lock()
+        watch = Watch(lock, 0, 0, 0, 0.01)
+        watch.queued = True
+        result = []
+        with lock:
+            # THE WORKER IS TAKING A SAMPLE WHILE stop() IS CALLED
+            stopper = Thread(target=lambda: result.append(watch.stop()))
+            stopper.start()
+            sleep(0.05)
+            watch.samples["main (test.py:1)"] = 1
+        stopper.join()
+        self.assertEqual(result, ["main (test.py:1) 1"])